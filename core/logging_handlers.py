@@ -0,0 +1,27 @@
+"""
+Logging handlers for the project.
+Moves console I/O off request and fetch worker threads.
+"""
+import atexit
+import logging
+import logging.handlers
+import queue
+
+
+class BackgroundStreamHandler(logging.handlers.QueueHandler):
+    """
+    Console handler that writes from a background thread.
+    Records are queued by the thread that logged them and written to stderr by a QueueListener,
+    so concurrent fetch workers never block on stream writes (or on each other's writes).
+    """
+
+    def __init__(self):
+        super().__init__(queue.SimpleQueue())
+        self.listener = logging.handlers.QueueListener(
+            self.queue,
+            logging.StreamHandler(),
+            respect_handler_level=True
+        )
+        self.listener.start()
+        # Flush anything still queued before the interpreter exits
+        atexit.register(self.listener.stop)
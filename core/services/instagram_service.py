@@ -1,97 +1,235 @@
 """
 Instagram service for fetching posts from RapidAPI.
 Handles API communication and data parsing for Instagram posts.
-Supports multiple API keys with random selection and automatic retry with different keys.
+Supports multiple API keys with least-loaded key selection and automatic retry with different keys.
 Optimized with smart rate limiting and API key rotation for faster fetching while respecting rate limits.
 """
 import requests
+from requests.adapters import HTTPAdapter
 import logging
 import time
-import random
+import math
 import json
 import os
+import heapq
+import queue
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional, Iterator
 from pathlib import Path
 from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
-from threading import Lock
+from threading import Lock, Thread, local
 from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
 
 logger = logging.getLogger(__name__)
 
+# Try to import orjson for faster decoding (and debug dumping) of API responses, but make it optional
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Directory for saving debug responses
 DEBUG_RESPONSES_DIR = Path(__file__).parent.parent.parent / "debug_responses"
+# Extra debug files tolerated past DEBUG_MAX_RESPONSE_FILES before a cleanup pass, so cleanup runs in batches
+DEBUG_CLEANUP_SLACK = 16
+
+# API and debug settings, read once at import instead of through the lazy settings object on every request
+_API_KEYS = tuple(getattr(settings, 'RAPIDAPI_KEYS', []) or [getattr(settings, 'RAPIDAPI_KEY', '')])
+_RAPIDAPI_HOST = getattr(settings, 'RAPIDAPI_HOST', 'instagram120.p.rapidapi.com')
+_DEBUG_SAVE = bool(getattr(settings, 'DEBUG_SAVE_RESPONSES', False))
+_DEBUG_MAX_FILES = int(getattr(settings, 'DEBUG_MAX_RESPONSE_FILES', 50))
+_DEBUG_REEL_TIMESTAMPS = bool(getattr(settings, 'DEBUG_REEL_TIMESTAMPS', False))
+_MAX_INFLIGHT = int(getattr(settings, 'INSTAGRAM_MAX_INFLIGHT', 0) or 0)
+# RapidAPI instagram120 endpoint URLs
+_URL_MEDIA_BY_SHORTCODE = "https://instagram120.p.rapidapi.com/api/instagram/mediaByShortcode"
+_URL_POST_DETAIL = "https://instagram120.p.rapidapi.com/api/instagram/post"
+_URL_REELS = "https://instagram120.p.rapidapi.com/api/instagram/reels"
+_URL_POSTS = "https://instagram120.p.rapidapi.com/api/instagram/posts"
+# Debug file prefix for each endpoint URL, used when saving responses (and to key cached shortcode lookups)
+_ENDPOINT_TYPES = {
+    _URL_MEDIA_BY_SHORTCODE: "media_by_shortcode",
+    _URL_POST_DETAIL: "post_detail",
+    _URL_REELS: "reels",
+    _URL_POSTS: "posts",
+}
+# Headers shared by every request; only x-rapidapi-key is set per request
+_BASE_HEADERS = {
+    "x-rapidapi-host": _RAPIDAPI_HOST,
+    "Content-Type": "application/json"
+}
 
 # Configuration constants for optimized fetching
 # API limit: 1 request per 4 seconds per API key (0.25 requests/second)
 # With 13 API keys, we can make 3.25 requests/sec total (13 * 0.25)
 # Each request fetches 1 page with 12 posts
 MIN_DELAY_BETWEEN_REQUESTS = 0.1  # Minimum delay between requests (seconds)
-RATE_LIMIT_WINDOW = 4  # Rate limit window in seconds (matches 1 request per 4 seconds)
-MAX_REQUESTS_PER_WINDOW = 1  # Max requests per window per API key (1 request per 4 seconds)
 CALLS_PER_SECOND_PER_KEY = 0.25  # API limit: 1 request per 4 seconds = 0.25 requests/second per key
+KEY_REQUEST_INTERVAL = 1 / CALLS_PER_SECOND_PER_KEY  # Seconds between requests on the same API key
+
+# Instagram snowflake ID epoch: January 1, 2010 00:00:00 UTC, in milliseconds
+INSTAGRAM_EPOCH_MS = 1262304000 * 1000
+INSTAGRAM_START = datetime(2010, 1, 1, tzinfo=timezone.utc)  # Snowflake timestamps before Instagram launched are invalid
+# Allowed clock skew for fallback timestamps, and how far in the future an API taken_at may be (scheduled posts).
+# Built once: constructing a timedelta costs more than the datetime addition it feeds.
+TIMESTAMP_SKEW = timedelta(days=1)
+MAX_FUTURE_TAKEN_AT = timedelta(days=365)
+
+# Maximum concurrent post detail lookups when filling in missing reel data
+MAX_DETAIL_LOOKUP_WORKERS = 5
+
+# Upper bound on accounts fetched concurrently by fetch_reels_for_accounts (size of its shared pool)
+MAX_ACCOUNT_WORKERS = 32
+
+# Lower bound on those workers (raised to one per API key when there are more keys), so a low measured
+# latency never leaves keys idle
+MIN_ACCOUNT_WORKERS = 10
+
+# Long-lived thread pools shared across calls, keyed by name (created lazily)
+_shared_executors: Dict[str, ThreadPoolExecutor] = {}
+_shared_executors_lock = Lock()
 
-# Global rate limiter for each API key
-_rate_limiters: Dict[str, deque] = {}
+# Fields that may carry a reel's play count, used for zero-play diagnostics
+KNOWN_PLAY_FIELDS = ("play_count", "video_play_count", "reel_play_count", "ig_play_count", "fb_play_count")
+
+# Shared HTTP session so concurrent workers reuse keep-alive connections to RapidAPI
+# instead of paying a fresh TCP+TLS handshake per request.
+# The adapter doesn't retry: _make_api_request retries itself, rotating to a different API key.
+# The pool is sized to the account worker pool so no worker's connection is discarded when it is returned.
+HTTP_POOL_MAXSIZE = MAX_ACCOUNT_WORKERS
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_connections=HTTP_POOL_MAXSIZE, pool_maxsize=HTTP_POOL_MAXSIZE, max_retries=0))
+
+# Per-key GCRA rate limiter state: theoretical arrival time (time.monotonic()) of each key's next allowed request
+_key_tat: Dict[str, float] = {}
+# One lock per key so threads using different keys never contend; _rate_limiter_lock only guards creating them
+_key_locks: Dict[str, Lock] = {}
 _rate_limiter_lock = Lock()
 
+# Short-lived cache of fetch results so accounts re-polled within the TTL don't re-hit the API
+# Maps (kind, username, *args) -> (expires_at, posts)
+FETCH_CACHE_TTL_SECONDS = 60
+_FETCH_CACHE_TTL = getattr(settings, 'INSTAGRAM_FETCH_CACHE_TTL', FETCH_CACHE_TTL_SECONDS)
+_fetch_cache: Dict[tuple, tuple] = {}
+_fetch_cache_lock = Lock()
+
+# How long per-shortcode responses stay in the Django cache, per endpoint:
+# mediaByShortcode video URLs and captions effectively never change, post detail carries a moving play_count
+SHORTCODE_CACHE_TTLS = {
+    _URL_MEDIA_BY_SHORTCODE: 86400,
+    _URL_POST_DETAIL: 300,
+}
+
+# Page requests currently in flight, keyed by (url, username, maxId), so concurrent fetches of the
+# same username (a scheduled scrape and a manual refresh, say) share one API call per page
+_inflight_pages: Dict[tuple, Future] = {}
+_inflight_pages_lock = Lock()
+
+# Debug responses waiting to be written by the background save thread (created on first save)
+DEBUG_SAVE_QUEUE_SIZE = 256
+_save_queue = None
+_save_queue_lock = Lock()
+
+# Requests currently in flight (including the rate-limit wait) per API key, used to spread load over keys
+_key_inflight: Dict[str, int] = {}
 
-def _get_rate_limiter(api_key: str) -> deque:
+# API keys rejected with 401/403, mapped to the time.monotonic() until which they are skipped.
+# Rejections can be transient (a RapidAPI glitch, a lapsed subscription being renewed), so keys come back
+# on their own: an auth failure (401) benches a key for 6 hours, a forbidden (403) for 1 hour.
+# A key is only benched while another key is still usable, so the last key never locks every request out.
+API_KEY_DISABLE_SECONDS = {401: 6 * 3600, 403: 3600}
+_api_key_disabled_until: Dict[str, float] = {}
+
+# HTTP status behind the last _make_api_request call on this thread that returned None (None for network errors),
+# so callers can tell a rate limit apart from a missing user or a server error without a new return type
+_request_failure = local()
+
+# Exponentially weighted moving average of RapidAPI round-trip time (seconds), None until the first response.
+# Updated without a lock: a lost update under contention only delays the average slightly.
+REQUEST_LATENCY_EWMA_ALPHA = 0.1
+_avg_request_latency: Optional[float] = None
+
+
+def _get_key_lock(api_key: str) -> Lock:
+    """Get or create the rate limiter lock for a specific API key."""
+    lock = _key_locks.get(api_key)
+    if lock is None:
+        with _rate_limiter_lock:
+            # setdefault keeps the lock another thread may have created while we waited
+            lock = _key_locks.setdefault(api_key, Lock())
+    return lock
+
+
+def _wait_for_rate_limit(api_key: str):
     """
-    Get or create a rate limiter deque for a specific API key.
-    Uses a sliding window approach to track API calls.
+    Wait if necessary to respect the rate limit for the given API key (1 request per 4 seconds per key).
+    Uses GCRA: each key stores the theoretical arrival time (TAT) of its next allowed request,
+    so admission is one lookup and one add. The slot is reserved under the key's lock and the
+    caller then sleeps outside it. The per-key limits already add up to the account-wide budget,
+    so no separate global limiter is needed.
     """
-    with _rate_limiter_lock:
-        if api_key not in _rate_limiters:
-            _rate_limiters[api_key] = deque()
-        return _rate_limiters[api_key]
+    with _get_key_lock(api_key):
+        now = time.monotonic()
+        tat = max(_key_tat.get(api_key, 0.0), now)
+        _key_tat[api_key] = tat + KEY_REQUEST_INTERVAL
+    
+    wait_time = tat - now
+    if wait_time > 0:
+        logger.debug("Waiting %.2f seconds for the next rate limit slot", wait_time)
+        time.sleep(wait_time)
 
 
-def _wait_for_rate_limit(api_key: str):
+def _cool_down_api_key(api_key: str, cooldown: float):
     """
-    Wait if necessary to respect rate limits for the given API key.
-    Uses a sliding window approach: tracks timestamps of recent API calls.
+    Keep a rate limited (429) key out of use for cooldown seconds.
+    Pushing its GCRA slot forward makes _pick_api_key prefer other keys in the meantime.
     """
-    limiter = _get_rate_limiter(api_key)
-    now = time.time()
-    
-    # Remove timestamps older than the rate limit window
-    while limiter and limiter[0] < now - RATE_LIMIT_WINDOW:
-        limiter.popleft()
-    
-    # If we've hit the limit, wait until the oldest call falls outside the window
-    if len(limiter) >= MAX_REQUESTS_PER_WINDOW:
-        wait_time = limiter[0] + RATE_LIMIT_WINDOW - now + 0.1  # Add small buffer
-        if wait_time > 0:
-            logger.debug(f"Rate limit reached for API key, waiting {wait_time:.2f} seconds")
-            time.sleep(wait_time)
-            # Clean up again after waiting
-            now = time.time()
-            while limiter and limiter[0] < now - RATE_LIMIT_WINDOW:
-                limiter.popleft()
-    
-    # Ensure minimum delay between requests (4 seconds between requests per key)
-    if limiter:
-        time_since_last = now - limiter[-1] if limiter else 0
-        min_interval = 4.0  # 4 seconds between requests (1 request per 4 seconds)
-        if time_since_last < min_interval:
-            wait_time = min_interval - time_since_last
-            # Only sleep if wait time is significant (avoid micro-sleeps)
-            if wait_time > 0.01:
-                logger.debug(f"Waiting {wait_time:.2f} seconds to respect 4-second interval for API key")
-                time.sleep(wait_time)
-                now = time.time()
-    
-    # Record this API call
-    limiter.append(time.time())
+    with _get_key_lock(api_key):
+        _key_tat[api_key] = max(_key_tat.get(api_key, 0.0), time.monotonic() + cooldown)
+
+
+def _disable_api_key(api_key: str, seconds: float):
+    """Skip a rejected key in _pick_api_key for the next `seconds` seconds."""
+    with _get_key_lock(api_key):
+        _api_key_disabled_until[api_key] = time.monotonic() + seconds
+
+
+def _usable_api_keys(api_keys: List[str], exclude: Optional[str] = None) -> List[str]:
+    """API keys that are not currently disabled, leaving out `exclude`."""
+    now = time.monotonic()
+    return [key for key in api_keys if key != exclude and _api_key_disabled_until.get(key, 0.0) <= now]
+
+
+def _get_save_queue() -> queue.Queue:
+    """Get the debug save queue, starting its background writer thread on first use."""
+    global _save_queue
+    
+    if _save_queue is None:
+        with _save_queue_lock:
+            # Double-check pattern: another thread might have created it while we waited
+            if _save_queue is None:
+                save_queue = queue.Queue(maxsize=DEBUG_SAVE_QUEUE_SIZE)
+                Thread(target=_save_worker, args=(save_queue,), name="instagram-debug-save", daemon=True).start()
+                _save_queue = save_queue
+    return _save_queue
+
+
+def _save_worker(save_queue: queue.Queue):
+    """Background thread body: write queued debug responses to disk one at a time."""
+    while True:
+        _write_response_file(*save_queue.get())
 
 
 def _save_response_to_file(response_data: Dict, endpoint_type: str, username: str = "", additional_info: str = ""):
     """
     Save API response JSON to a file for debugging purposes.
-    Only saves if DEBUG_SAVE_RESPONSES is enabled in settings.
+    Callers only invoke this when DEBUG_SAVE_RESPONSES is enabled in settings.
+    The file is written by a background thread so the request path never waits on disk I/O;
+    if the queue is full (slow disk) the response is dropped rather than blocking the caller.
     
     Args:
         response_data: The JSON response data to save
@@ -99,9 +237,14 @@ def _save_response_to_file(response_data: Dict, endpoint_type: str, username: st
         username: Instagram username (optional, for filename)
         additional_info: Additional info for filename (optional)
     """
-    if not getattr(settings, 'DEBUG_SAVE_RESPONSES', False):
-        return
-    
+    try:
+        _get_save_queue().put_nowait((response_data, endpoint_type, username, additional_info, datetime.now()))
+    except queue.Full:
+        logger.debug("Debug save queue is full; dropping %s response", endpoint_type)
+
+
+def _write_response_file(response_data: Dict, endpoint_type: str, username: str, additional_info: str, received_at: datetime):
+    """Write one debug response to DEBUG_RESPONSES_DIR/<endpoint_type>/ and prune old files (runs on the save thread)."""
     try:
         # Create debug_responses directory if it doesn't exist
         DEBUG_RESPONSES_DIR.mkdir(parents=True, exist_ok=True)
@@ -111,7 +254,7 @@ def _save_response_to_file(response_data: Dict, endpoint_type: str, username: st
         endpoint_dir.mkdir(parents=True, exist_ok=True)
         
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
+        timestamp = received_at.strftime("%Y%m%d_%H%M%S_%f")[:-3]  # Include milliseconds
         safe_username = username.replace('@', '').replace('/', '_') if username else "unknown"
         safe_info = additional_info.replace('/', '_').replace('\\', '_') if additional_info else ""
         
@@ -119,65 +262,116 @@ def _save_response_to_file(response_data: Dict, endpoint_type: str, username: st
         filename = "_".join([p for p in filename_parts if p]) + ".json"
         filepath = endpoint_dir / filename
         
-        # Save JSON response
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(response_data, f, indent=2, ensure_ascii=False)
+        # Save JSON response (compact: the files are for tooling, and pretty-printing is several times slower)
+        if ORJSON_AVAILABLE:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(response_data))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(response_data, f, ensure_ascii=False, separators=(',', ':'))
         
-        logger.debug(f"Saved API response to: {filepath}")
+        logger.debug("Saved API response to: %s", filepath)
         
         # Cleanup old files to prevent disk space issues
         _cleanup_old_response_files(endpoint_dir, endpoint_type)
         
     except Exception as e:
-        logger.warning(f"Failed to save debug response to file: {e}")
+        logger.warning("Failed to save debug response to file: %s", e)
 
 
 def _cleanup_old_response_files(directory: Path, endpoint_type: str):
     """
     Remove old response files, keeping only the most recent N files.
     Prevents disk space issues from accumulating too many debug files.
+    Only runs once the directory is DEBUG_CLEANUP_SLACK files over the limit, and picks the
+    oldest files with a heap instead of sorting the whole directory.
     
     Args:
         directory: Directory containing response files
         endpoint_type: Type of endpoint (for logging)
     """
     try:
-        max_files = getattr(settings, 'DEBUG_MAX_RESPONSE_FILES', 50)
+        max_files = _DEBUG_MAX_FILES
         
-        # Get all JSON files in directory, sorted by modification time (newest first)
-        json_files = sorted(
-            directory.glob("*.json"),
-            key=lambda f: f.stat().st_mtime,
-            reverse=True
-        )
+        json_files = list(directory.glob("*.json"))
+        if len(json_files) <= max_files + DEBUG_CLEANUP_SLACK:
+            return
         
-        # Remove files beyond the limit
-        if len(json_files) > max_files:
-            files_to_remove = json_files[max_files:]
-            for file_to_remove in files_to_remove:
-                try:
-                    file_to_remove.unlink()
-                    logger.debug(f"Removed old debug response file: {file_to_remove}")
-                except Exception as e:
-                    logger.warning(f"Failed to remove old debug file {file_to_remove}: {e}")
-            
-            logger.info(f"Cleaned up {len(files_to_remove)} old {endpoint_type} response files, kept {max_files} most recent")
+        # Remove the oldest files beyond the limit
+        files_to_remove = heapq.nsmallest(len(json_files) - max_files, json_files, key=lambda f: f.stat().st_mtime)
+        for file_to_remove in files_to_remove:
+            try:
+                file_to_remove.unlink()
+                logger.debug("Removed old debug response file: %s", file_to_remove)
+            except Exception as e:
+                logger.warning("Failed to remove old debug file %s: %s", file_to_remove, e)
+        
+        logger.info("Cleaned up %s old %s response files, kept %s most recent", len(files_to_remove), endpoint_type, max_files)
     
     except Exception as e:
-        logger.warning(f"Failed to cleanup old response files: {e}")
+        logger.warning("Failed to cleanup old response files: %s", e)
+
+
+def _decode_response(response: requests.Response):
+    """
+    Decode a JSON API response body.
+    Uses orjson directly on the raw bytes when available (skips the text decode done by response.json()).
+    Invalid bodies fall through to response.json() so callers still get requests' JSONDecodeError.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+
+def _json_for_log(data: Dict) -> str:
+    """Serialize a small dict of diagnostic fields to a compact JSON string for a structured log record."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str, separators=(',', ':'))
 
 
-def _get_random_api_key() -> str:
+def _record_request_latency(latency: float):
+    """Fold one request's round-trip time into the moving average."""
+    global _avg_request_latency
+    if _avg_request_latency is None:
+        _avg_request_latency = latency
+    else:
+        _avg_request_latency += REQUEST_LATENCY_EWMA_ALPHA * (latency - _avg_request_latency)
+
+
+def _pick_api_key(api_keys: List[str], exclude: Optional[str] = None) -> Optional[str]:
     """
-    Get a random API key from the configured list.
-    This helps distribute load across multiple keys.
+    Pick the API key whose next rate-limit slot is soonest, breaking ties by fewest in-flight requests.
+    Concurrent callers therefore spread over idle keys instead of colliding on one and waiting 4 seconds,
+    and keys cooling down after a 429 are only used once nothing sooner is available.
+    Keys disabled after a 401/403 (and `exclude`) are skipped; returns None if no other key is usable.
+    The chosen key is counted as in flight until _release_api_key is called.
     """
-    api_keys = getattr(settings, 'RAPIDAPI_KEYS', [])
-    if not api_keys:
-        api_keys = [getattr(settings, 'RAPIDAPI_KEY', '')]
-    if not api_keys or not api_keys[0]:
-        raise ValueError("No RapidAPI keys configured in settings")
-    return random.choice(api_keys)
+    usable_keys = _usable_api_keys(api_keys, exclude)
+    if not usable_keys:
+        return None
+    now = time.monotonic()
+    api_key = min(
+        usable_keys,
+        key=lambda key: (max(_key_tat.get(key, 0.0) - now, 0.0), _key_inflight.get(key, 0))
+    )
+    with _get_key_lock(api_key):
+        _key_inflight[api_key] = _key_inflight.get(api_key, 0) + 1
+    return api_key
+
+
+def _release_api_key(api_key: str):
+    """Mark a request picked by _pick_api_key as finished."""
+    with _get_key_lock(api_key):
+        _key_inflight[api_key] -= 1
+
+
+def _last_request_failure_status() -> Optional[int]:
+    """HTTP status that made this thread's last _make_api_request return None, or None if it wasn't an HTTP error."""
+    return getattr(_request_failure, "status", None)
 
 
 def _make_api_request(url: str, payload: Dict, method: str = "POST", max_retries: int = 3) -> Optional[Dict]:
@@ -193,67 +387,103 @@ def _make_api_request(url: str, payload: Dict, method: str = "POST", max_retries
         max_retries: Maximum number of retry attempts with different keys
     
     Returns:
-        JSON response as dict, or None if all retries failed
+        JSON response as dict, or None if all retries failed (see _last_request_failure_status for why)
     """
-    api_keys = getattr(settings, 'RAPIDAPI_KEYS', [])
-    if not api_keys:
-        api_keys = [getattr(settings, 'RAPIDAPI_KEY', '')]
-    
-    if not api_keys or not api_keys[0]:
+    _request_failure.status = None
+    api_keys = _API_KEYS
+    if not api_keys[0]:
         logger.error("No RapidAPI keys configured")
         return None
     
+    # Key that returned 403 during this call. It is only benched once another key serves the same request;
+    # if a second key is refused too, the content is forbidden (private/blocked profile), not the key.
+    forbidden_key = None
+    
     # Try each API key until one works
     for attempt in range(max_retries):
-        api_key = _get_random_api_key()
+        api_key = _pick_api_key(api_keys, exclude=forbidden_key)
+        if api_key is None:
+            if forbidden_key is not None:
+                logger.error("403 Forbidden for %s with payload: %s and no other API key to confirm it", url, payload)
+                _request_failure.status = 403
+            else:
+                logger.error("All RapidAPI keys are temporarily disabled after 401/403 responses")
+                _request_failure.status = 401
+            return None
         _wait_for_rate_limit(api_key)
         
-        headers = {
-            "x-rapidapi-key": api_key,
-            "x-rapidapi-host": getattr(settings, 'RAPIDAPI_HOST', 'instagram120.p.rapidapi.com'),
-            "Content-Type": "application/json"
-        }
+        headers = dict(_BASE_HEADERS)
+        headers["x-rapidapi-key"] = api_key
         
         try:
-            if method.upper() == "POST":
-                response = requests.post(url, json=payload, headers=headers, timeout=30)
-            else:
-                response = requests.get(url, params=payload, headers=headers, timeout=30)
+            request_started = time.monotonic()
+            try:
+                if method.upper() == "POST":
+                    response = _session.post(url, json=payload, headers=headers, timeout=30)
+                else:
+                    response = _session.get(url, params=payload, headers=headers, timeout=30)
+            finally:
+                _release_api_key(api_key)
+            _record_request_latency(time.monotonic() - request_started)
             
             # Handle 404 specifically - might mean user doesn't exist or endpoint changed
             if response.status_code == 404:
-                logger.error(f"404 Not Found for URL: {url} with payload: {payload}. This might mean:")
+                logger.error("404 Not Found for URL: %s with payload: %s. This might mean:", url, payload)
                 logger.error("  - The username doesn't exist")
                 logger.error("  - The API endpoint has changed")
-                logger.error(f"  - Response: {response.text[:200]}")
+                logger.error("  - Response: %s", response.text[:200])
                 # Don't retry on 404, it's unlikely to succeed
+                _request_failure.status = 404
                 return None
             
-            # Handle 429 (Too Many Requests) with exponential backoff
+            # Handle 401/403 - the key may be invalid, expired or not subscribed: try another key
+            if response.status_code in (401, 403):
+                if response.status_code == 403 and forbidden_key is not None:
+                    # Two keys refused the same request: it's the content (private/blocked profile), not the keys
+                    logger.error("403 Forbidden from two API keys for %s with payload: %s; not retrying", url, payload)
+                    _request_failure.status = 403
+                    return None
+                if attempt == max_retries - 1 or not _usable_api_keys(api_keys, exclude=api_key):
+                    # Last attempt, or no other key to fall back on: don't bench the only key that might still work
+                    logger.error("API key rejected with %s for %s (attempt %s/%s); no other key to retry with", response.status_code, url, attempt + 1, max_retries)
+                    _request_failure.status = response.status_code
+                    return None
+                if response.status_code == 403:
+                    # Benched only if another key then succeeds (see below)
+                    logger.warning("403 Forbidden for %s; retrying with another API key (attempt %s/%s)", url, attempt + 1, max_retries)
+                    forbidden_key = api_key
+                else:
+                    disable_seconds = API_KEY_DISABLE_SECONDS[401]
+                    logger.error("API key rejected with 401 for %s; disabling it for %s seconds (attempt %s/%s)", url, disable_seconds, attempt + 1, max_retries)
+                    _disable_api_key(api_key, disable_seconds)
+                continue  # Retry immediately with another key
+            
+            # Handle 429 (Too Many Requests): cool the key down and fail over to another one
             if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 10))  # Default to 60 seconds
-                wait_time = min(retry_after, 120)  # Cap at 2 minutes
-                logger.warning(f"Rate limit exceeded (429) for {url}. Waiting {wait_time} seconds before retry (attempt {attempt + 1}/{max_retries})")
+                retry_after = int(response.headers.get('Retry-After', 10))  # Default to 10 seconds
+                cooldown = min(retry_after, 120)  # Cap at 2 minutes
+                _cool_down_api_key(api_key, cooldown)
                 if attempt < max_retries - 1:
-                    time.sleep(wait_time)
-                    continue  # Retry with same or different key
+                    # No sleep here: the next pick prefers a healthy key, and only waits if every key is cooling down
+                    logger.warning("Rate limit exceeded (429) for %s. Cooling key down for %s seconds and retrying (attempt %s/%s)", url, cooldown, attempt + 1, max_retries)
+                    continue
                 else:
-                    logger.error(f"Rate limit exceeded after {max_retries} attempts for URL: {url}")
+                    logger.error("Rate limit exceeded after %s attempts for URL: %s", max_retries, url)
+                    _request_failure.status = 429
                     return None
             
             response.raise_for_status()
-            response_data = response.json()
+            response_data = _decode_response(response)
+            
+            if forbidden_key is not None:
+                # Another key served the request the forbidden key was refused: the key itself is the problem
+                disable_seconds = API_KEY_DISABLE_SECONDS[403]
+                logger.error("API key rejected with 403 but another key succeeded; disabling it for %s seconds", disable_seconds)
+                _disable_api_key(forbidden_key, disable_seconds)
             
             # Save response to file if debug mode is enabled
-            if getattr(settings, 'DEBUG_SAVE_RESPONSES', False):
-                # Determine endpoint type from URL
-                endpoint_type = "unknown"
-                if "/reels" in url:
-                    endpoint_type = "reels"
-                elif "/posts" in url:
-                    endpoint_type = "posts"
-                elif "/post" in url:
-                    endpoint_type = "post_detail"
+            if _DEBUG_SAVE:
+                endpoint_type = _ENDPOINT_TYPES.get(url, "unknown")
                 
                 # Extract username from payload if available
                 username = payload.get("username", "") if isinstance(payload, dict) else ""
@@ -263,40 +493,85 @@ def _make_api_request(url: str, payload: Dict, method: str = "POST", max_retries
             
             return response_data
         except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 404:
-                logger.error(f"404 Not Found: {e.response.text[:200] if e.response else 'No response'}")
-                return None
-            elif e.response.status_code == 429:
-                # Handle 429 in exception handler as well (in case raise_for_status wasn't called)
-                retry_after = int(e.response.headers.get('Retry-After', 60))
-                wait_time = min(retry_after, 120)
-                logger.warning(f"Rate limit exceeded (429) for {url}. Waiting {wait_time} seconds (attempt {attempt + 1}/{max_retries})")
-                if attempt < max_retries - 1:
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    logger.error(f"Rate limit exceeded after {max_retries} attempts for URL: {url}")
-                    return None
-            logger.warning(f"HTTP error {e.response.status_code} (attempt {attempt + 1}/{max_retries}): {e}")
+            # 401/403/404/429 are handled above before raise_for_status(), so only other 4xx/5xx get here
+            logger.warning("HTTP error %s (attempt %s/%s): %s", e.response.status_code, attempt + 1, max_retries, e)
             if attempt < max_retries - 1:
                 # Exponential backoff for other errors
                 wait_time = min(2 ** attempt, 10)  # 1s, 2s, 4s, max 10s
                 time.sleep(wait_time)
             else:
-                logger.error(f"All API key attempts failed for URL: {url} with payload: {payload}")
+                logger.error("All API key attempts failed for URL: %s with payload: %s", url, payload)
+                _request_failure.status = e.response.status_code
                 return None
         except requests.exceptions.RequestException as e:
-            logger.warning(f"API request failed with key (attempt {attempt + 1}/{max_retries}): {e}")
+            logger.warning("API request failed with key (attempt %s/%s): %s", attempt + 1, max_retries, e)
             if attempt < max_retries - 1:
                 # Try a different key on next iteration
                 time.sleep(1)
             else:
-                logger.error(f"All API key attempts failed for URL: {url} with payload: {payload}")
+                logger.error("All API key attempts failed for URL: %s with payload: %s", url, payload)
                 return None
     
     return None
 
 
+def _cached_shortcode_request(url: str, shortcode: str) -> Optional[Dict]:
+    """
+    POST {"shortcode": shortcode} to an instagram120 endpoint URL, memoized in the Django cache.
+    Identical lookups within the endpoint's SHORTCODE_CACHE_TTLS entry reuse the response instead of
+    spending rate-limited quota (a hit skips the rate limiter entirely); failed lookups (None) are not
+    cached so they are retried next time.
+    """
+    cache_key = f"ig:{_ENDPOINT_TYPES[url]}:{shortcode}"
+    response_data = cache.get(cache_key)
+    if response_data is None:
+        response_data = _make_api_request(url, {"shortcode": shortcode}, method="POST")
+        if response_data is not None:
+            cache.set(cache_key, response_data, SHORTCODE_CACHE_TTLS[url])
+    return response_data
+
+
+def _fetch_post_detail(post_code: str) -> Optional[Dict]:
+    """Fetch (or reuse the cached) post detail response for a shortcode; shared by the play_count and video URL lookups."""
+    return _cached_shortcode_request(_URL_POST_DETAIL, post_code)
+
+
+def _fetch_page_response(url: str, username: str, end_cursor: Optional[str] = None) -> Optional[Dict]:
+    """
+    POST a paginated {"username", "maxId"} request, coalescing identical requests that are already in flight.
+    The first caller for a (url, username, cursor) makes the API call; callers arriving while it runs
+    wait for and share its response (including None on failure, with its _last_request_failure_status)
+    rather than sending their own.
+    Nothing is kept once the call completes, so later requests always see fresh data.
+    """
+    max_id = end_cursor if end_cursor else ""
+    key = (url, username, max_id)
+    with _inflight_pages_lock:
+        future = _inflight_pages.get(key)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            _inflight_pages[key] = future
+    
+    if not is_owner:
+        logger.debug("Joining in-flight request for %s (cursor: %s)", username, end_cursor)
+        response_data, _request_failure.status = future.result()
+        return response_data
+    
+    try:
+        response_data = _make_api_request(url, {"username": username, "maxId": max_id}, method="POST")
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        # Waiters get the failure status too, so they can react to a rate limit like the owner would
+        future.set_result((response_data, _last_request_failure_status()))
+    finally:
+        with _inflight_pages_lock:
+            del _inflight_pages[key]
+    return response_data
+
+
 def _fetch_video_url_by_shortcode(shortcode: str) -> Optional[Dict[str, str]]:
     """
     Fetch video URL and caption for a reel/post using the mediaByShortcode endpoint.
@@ -313,15 +588,10 @@ def _fetch_video_url_by_shortcode(shortcode: str) -> Optional[Dict[str, str]]:
         return None
     
     try:
-        url = "https://instagram120.p.rapidapi.com/api/instagram/mediaByShortcode"
-        payload = {
-            "shortcode": shortcode
-        }
-        
-        response_data = _make_api_request(url, payload, method="POST")
+        response_data = _cached_shortcode_request(_URL_MEDIA_BY_SHORTCODE, shortcode)
         
         if not response_data:
-            logger.warning(f"Could not fetch data from mediaByShortcode for shortcode: {shortcode}")
+            logger.warning("Could not fetch data from mediaByShortcode for shortcode: %s", shortcode)
             return None
         
         # Response is an array: [{"urls": [{"url": "..."}], "meta": {"title": "...", ...}, ...}]
@@ -347,14 +617,14 @@ def _fetch_video_url_by_shortcode(shortcode: str) -> Optional[Dict[str, str]]:
                         result['caption'] = caption
                 
                 if result:
-                    logger.info(f"Successfully fetched data from mediaByShortcode for shortcode {shortcode}: video_url={'Yes' if 'video_url' in result else 'No'}, caption={'Yes' if 'caption' in result else 'No'}")
+                    logger.info("Successfully fetched data from mediaByShortcode for shortcode %s: video_url=%s, caption=%s", shortcode, 'Yes' if 'video_url' in result else 'No', 'Yes' if 'caption' in result else 'No')
                     return result
         
-        logger.warning(f"No data found in mediaByShortcode response for shortcode: {shortcode}")
+        logger.warning("No data found in mediaByShortcode response for shortcode: %s", shortcode)
         return None
             
     except Exception as e:
-        logger.error(f"Error fetching data from mediaByShortcode for shortcode {shortcode}: {e}", exc_info=True)
+        logger.error("Error fetching data from mediaByShortcode for shortcode %s: %s", shortcode, e, exc_info=True)
         return None
 
 
@@ -373,16 +643,11 @@ def _fetch_reel_play_count(post_code: str) -> Optional[int]:
         return None
     
     try:
-        # Try using the post detail endpoint
-        url = "https://instagram120.p.rapidapi.com/api/instagram/post"
-        payload = {
-            "shortcode": post_code
-        }
-        
-        response_data = _make_api_request(url, payload, method="POST")
+        # Use the post detail endpoint (cached, so play_count and video URL lookups share one request)
+        response_data = _fetch_post_detail(post_code)
         
         if not response_data:
-            logger.warning(f"Could not fetch post details for play_count, code: {post_code}")
+            logger.warning("Could not fetch post details for play_count, code: %s", post_code)
             return None
         
         # Parse the response to extract play_count
@@ -413,17 +678,52 @@ def _fetch_reel_play_count(post_code: str) -> Optional[int]:
         
         if play_count is not None:
             play_count = int(play_count)
-            logger.info(f"Successfully fetched play_count {play_count} for reel code {post_code}")
+            logger.info("Successfully fetched play_count %s for reel code %s", play_count, post_code)
             return play_count
         else:
-            logger.warning(f"No play_count found in post detail response for code: {post_code}")
+            logger.warning("No play_count found in post detail response for code: %s", post_code)
             return None
             
     except Exception as e:
-        logger.error(f"Error fetching play_count for reel code {post_code}: {e}", exc_info=True)
+        logger.error("Error fetching play_count for reel code %s: %s", post_code, e, exc_info=True)
         return None
 
 
+def _get_shared_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """
+    Get the long-lived thread pool registered under name, creating it on first use.
+    Reusing pools avoids spinning up and tearing down worker threads on every call;
+    idle threads are joined by concurrent.futures at interpreter exit.
+    """
+    executor = _shared_executors.get(name)
+    if executor is None:
+        with _shared_executors_lock:
+            # Double-check pattern: another thread might have created it while we waited
+            executor = _shared_executors.get(name)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"instagram-{name}")
+                _shared_executors[name] = executor
+    return executor
+
+
+def _fill_missing_play_counts(reels: List[Dict]):
+    """
+    Fill in play_count for parsed reels that came back without one, using the post detail endpoint.
+    Lookups run concurrently (bounded by MAX_DETAIL_LOOKUP_WORKERS) instead of one blocking call
+    per reel; the per-key rate limiter still spaces out the underlying requests.
+    
+    Args:
+        reels: Parsed reel dictionaries with a post_code; updated in place
+    """
+    logger.debug("Fetching play_count for %s reels from post detail endpoint", len(reels))
+    
+    play_counts = _get_shared_executor("detail", MAX_DETAIL_LOOKUP_WORKERS).map(_fetch_reel_play_count, [reel["post_code"] for reel in reels])
+    for reel, play_count in zip(reels, play_counts):
+        if play_count is not None and play_count > 0:
+            reel["play_count"] = play_count
+            logger.info("Fetched play_count %s from post detail endpoint for reel %s", play_count, reel.get('post_id'))
+
+
 def _fetch_reel_video_url(post_code: str) -> Optional[str]:
     """
     Fetch video URL for a reel using the post code.
@@ -439,16 +739,11 @@ def _fetch_reel_video_url(post_code: str) -> Optional[str]:
         return None
     
     try:
-        # Try using the post detail endpoint
-        url = "https://instagram120.p.rapidapi.com/api/instagram/post"
-        payload = {
-            "shortcode": post_code
-        }
-        
-        response_data = _make_api_request(url, payload, method="POST")
+        # Use the post detail endpoint (cached, so play_count and video URL lookups share one request)
+        response_data = _fetch_post_detail(post_code)
         
         if not response_data:
-            logger.warning(f"Could not fetch post details for code: {post_code}")
+            logger.warning("Could not fetch post details for code: %s", post_code)
             return None
         
         # Parse the response to extract video URL
@@ -458,37 +753,79 @@ def _fetch_reel_video_url(post_code: str) -> Optional[str]:
         # Check in result.post or result directly
         result = response_data.get("result", response_data)
         if isinstance(result, dict):
-            # Check for video_versions
-            if "video_versions" in result and result["video_versions"]:
-                if isinstance(result["video_versions"], list) and len(result["video_versions"]) > 0:
-                    video_url = result["video_versions"][0].get("url")
-            
-            # Check for video_url directly
-            if not video_url and "video_url" in result:
-                video_url = result["video_url"]
-            
-            # Check in nested media structure
-            if not video_url and "media" in result:
-                media = result["media"]
-                if isinstance(media, dict):
-                    if "video_versions" in media and media["video_versions"]:
-                        if isinstance(media["video_versions"], list) and len(media["video_versions"]) > 0:
-                            video_url = media["video_versions"][0].get("url")
-                    if not video_url and "video_url" in media:
-                        video_url = media["video_url"]
+            # Check result itself, then the nested media structure: video_versions first, then video_url directly
+            for source in (result, result.get("media")):
+                if not isinstance(source, dict):
+                    continue
+                video_versions = source.get("video_versions")
+                if isinstance(video_versions, list) and video_versions:
+                    video_url = video_versions[0].get("url")
+                if not video_url:
+                    video_url = source.get("video_url")
+                if video_url:
+                    break
         
         if video_url:
-            logger.info(f"Successfully fetched video URL for reel code {post_code}")
+            logger.info("Successfully fetched video URL for reel code %s", post_code)
             return video_url
         else:
-            logger.warning(f"No video URL found in post detail response for code: {post_code}")
+            logger.warning("No video URL found in post detail response for code: %s", post_code)
             return None
             
     except Exception as e:
-        logger.error(f"Error fetching video URL for reel code {post_code}: {e}", exc_info=True)
+        logger.error("Error fetching video URL for reel code %s: %s", post_code, e, exc_info=True)
         return None
 
 
+# Per-shortcode lookups available to fetch_many_shortcodes, by kind
+_SHORTCODE_FETCHERS = {
+    "media": _fetch_video_url_by_shortcode,
+    "play_count": _fetch_reel_play_count,
+    "video_url": _fetch_reel_video_url,
+}
+
+
+def fetch_many_shortcodes(codes: List[str], kind: str = "media") -> Dict[str, Any]:
+    """
+    Run a per-shortcode lookup for many shortcodes concurrently.
+    One worker per API key keeps every key busy; the per-key rate limiter and
+    soonest-slot key selection space out the underlying requests.
+    
+    Args:
+        codes: Instagram post/reel shortcodes (duplicates are looked up once)
+        kind: "media" (video URL and caption), "play_count" or "video_url"
+    
+    Returns:
+        Dictionary mapping each shortcode to its lookup result (None if the lookup failed)
+    """
+    fetcher = _SHORTCODE_FETCHERS.get(kind)
+    if fetcher is None:
+        raise ValueError(f"Unknown shortcode lookup kind: {kind}")
+    
+    codes = list(dict.fromkeys(code for code in codes if code))
+    if not codes:
+        return {}
+    
+    executor = _get_shared_executor("shortcodes", len(_API_KEYS))
+    futures = {executor.submit(fetcher, code): code for code in codes}
+    
+    results = {}
+    for future in as_completed(futures):
+        code = futures[future]
+        try:
+            results[code] = future.result()
+        except Exception as e:
+            logger.error("Error in %s lookup for shortcode %s: %s", kind, code, e)
+            results[code] = None
+    return results
+
+
+@lru_cache(maxsize=8192)
+def _snowflake_to_datetime(post_id_int: int) -> datetime:
+    """Decode the creation time of an Instagram snowflake ID; pure, so repeated IDs across pages are a cache hit."""
+    return datetime.fromtimestamp(((post_id_int >> 22) + INSTAGRAM_EPOCH_MS) / 1000.0, tz=timezone.utc)
+
+
 def _extract_timestamp_from_post_id(post_id: str) -> Optional[datetime]:
     """
     Extract timestamp from Instagram post ID (snowflake ID).
@@ -504,45 +841,180 @@ def _extract_timestamp_from_post_id(post_id: str) -> Optional[datetime]:
         # Convert post ID to integer
         post_id_int = int(post_id)
         
-        # Instagram epoch: January 1, 2010 00:00:00 UTC
-        instagram_epoch = 1262304000  # Unix timestamp for 2010-01-01 00:00:00 UTC
-        
         # Instagram snowflake ID structure:
         # - Bits 0-41: timestamp (milliseconds since Instagram epoch)
         # - Bits 42-51: machine ID
         # - Bits 52-63: sequence number
         
         # Extract timestamp: right shift by 22 bits (removes machine ID and sequence)
-        timestamp_ms = (post_id_int >> 22) + instagram_epoch * 1000
+        extracted_dt = _snowflake_to_datetime(post_id_int)
         
-        # Convert milliseconds to seconds
-        timestamp_s = timestamp_ms / 1000.0
+        # Validate the extracted timestamp is reasonable (the future bound moves, so it isn't cached)
+        max_future_date = timezone.now() + TIMESTAMP_SKEW  # Allow up to 1 day in future for edge cases
         
-        # Convert to datetime
-        extracted_dt = datetime.fromtimestamp(timestamp_s, tz=timezone.utc)
-        
-        # Validate the extracted timestamp is reasonable
-        # Instagram launched in 2010, so timestamps before that are invalid
-        instagram_start = datetime(2010, 1, 1, tzinfo=timezone.utc)
-        now = timezone.now()
-        max_future_date = now + timedelta(days=1)  # Allow up to 1 day in future for edge cases
-        
-        if extracted_dt < instagram_start:
-            logger.warning(f"Extracted timestamp {extracted_dt} from post ID {post_id} is before Instagram existed")
+        if extracted_dt < INSTAGRAM_START:
+            logger.warning("Extracted timestamp %s from post ID %s is before Instagram existed", extracted_dt, post_id)
             return None
         
         if extracted_dt > max_future_date:
-            logger.warning(f"Extracted timestamp {extracted_dt} from post ID {post_id} is too far in the future")
+            logger.warning("Extracted timestamp %s from post ID %s is too far in the future", extracted_dt, post_id)
             return None
         
         return extracted_dt
         
     except (ValueError, OSError, OverflowError) as e:
-        logger.warning(f"Error extracting timestamp from post ID {post_id}: {e}")
+        logger.warning("Error extracting timestamp from post ID %s: %s", post_id, e)
         return None
 
 
-def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optional[Dict]:
+def _timestamp_from_post_id(post_id, max_date: datetime) -> Optional[datetime]:
+    """
+    Fast path for _extract_timestamp_from_post_id used by the parser fallbacks.
+    Decodes the snowflake timestamp directly with a single shift when post_id is an int
+    or a string of ASCII digits, and only returns it if it is not later than max_date.
+    Anything else goes through the validating helper.
+    """
+    if type(post_id) is int:
+        post_id_int = post_id
+    elif isinstance(post_id, str) and post_id.isascii() and post_id.isdecimal():
+        post_id_int = int(post_id)
+    else:
+        extracted = _extract_timestamp_from_post_id(post_id)
+        return extracted if extracted and extracted <= max_date else None
+    
+    try:
+        extracted = _snowflake_to_datetime(post_id_int)
+    except (ValueError, OSError, OverflowError):
+        return None
+    return extracted if extracted <= max_date else None
+
+
+def _caption_created_at_to_datetime(caption_created_at) -> Optional[datetime]:
+    """Convert a caption.created_at Unix timestamp to a UTC datetime, or None if it can't be converted."""
+    try:
+        return datetime.fromtimestamp(float(caption_created_at), tz=timezone.utc)
+    except (TypeError, ValueError, OSError, OverflowError):
+        return None
+
+
+def _safe_int(value, default=0):
+    """Safely convert value to int, handling None and invalid values."""
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def _as_int(value):
+    """Return value unchanged if it's already an int (the common case), else coerce via _safe_int."""
+    return value if type(value) is int else _safe_int(value, 0)
+
+
+def _first_present(dicts, key):
+    """Return the first truthy value for key across dicts (in priority order), or None."""
+    for d in dicts:
+        value = d.get(key)
+        if value:
+            return value
+    return None
+
+
+def _first_not_none(dicts, key):
+    """Return the first non-None value for key across dicts (in priority order), or None."""
+    for d in dicts:
+        value = d.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def _page_nodes(result: Dict, fallback_key: str) -> List[Dict]:
+    """
+    Return the post/reel nodes of a page result in one pass.
+    Takes result["edges"], or result[fallback_key] ("posts" / "reels") when that is empty,
+    unwraps {"node": ...} edges and drops anything that isn't a dict.
+    """
+    nodes = []
+    for edge in result.get("edges") or result.get(fallback_key) or ():
+        if isinstance(edge, dict):
+            node = edge.get("node", edge)
+            if isinstance(node, dict):
+                nodes.append(node)
+    return nodes
+
+
+def _is_reel_node(node: Dict) -> bool:
+    """Cheap pre-parse check for a reel: product_type "clips" on the node or its nested media (same rule as parse_instagram_post)."""
+    if node.get("product_type") == "clips":
+        return True
+    media = node.get("media")
+    return isinstance(media, dict) and media.get("product_type") == "clips"
+
+
+def _reels_node_play_count(node: Dict):
+    """
+    Find a reel's play count in a reels-endpoint node.
+    Checks play_count, then view_count, on the node, its nested media and its clips_metadata,
+    then the other known play-count fields on the node. Returns None if none is set.
+    """
+    for source in (node, node.get("media"), node.get("clips_metadata")):
+        if isinstance(source, dict):
+            value = source.get("play_count")
+            if value is None:
+                value = source.get("view_count")
+            if value is not None:
+                return value
+    for key in KNOWN_PLAY_FIELDS:
+        value = node.get(key)
+        if isinstance(value, (int, float)):
+            return value
+    return None
+
+
+def _get_cached_posts(key: tuple) -> Optional[List[Dict]]:
+    """Return a copy of the cached posts for key, or None if missing or expired."""
+    with _fetch_cache_lock:
+        entry = _fetch_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, posts = entry
+        if time.monotonic() >= expires_at:
+            del _fetch_cache[key]
+            return None
+    # Copy so callers mutating the result (e.g. setting is_reel) can't poison the cache
+    return [dict(post) for post in posts]
+
+
+def _set_cached_posts(key: tuple, posts: List[Dict]):
+    """Cache a copy of posts for key for INSTAGRAM_FETCH_CACHE_TTL seconds (0 disables caching)."""
+    ttl = _FETCH_CACHE_TTL
+    if not ttl or ttl <= 0:
+        return
+    snapshot = [dict(post) for post in posts]
+    with _fetch_cache_lock:
+        _fetch_cache[key] = (time.monotonic() + ttl, snapshot)
+
+
+def clear_fetch_cache(username: Optional[str] = None):
+    """
+    Invalidate cached fetch results.
+    
+    Args:
+        username: Optional. If provided, only drop entries for this username.
+                 If None, clear the whole cache.
+    """
+    with _fetch_cache_lock:
+        if username is None:
+            _fetch_cache.clear()
+            return
+        username = str(username).strip().lstrip('@').lower()
+        for key in [key for key in _fetch_cache if key[1] == username]:
+            del _fetch_cache[key]
+
+
+def parse_instagram_post(post_node: Dict, skip_video_url: bool = False, now: Optional[datetime] = None) -> Optional[Dict]:
     """
     Parse a single Instagram post from API response.
     Handles both regular posts and reels, with comprehensive timestamp extraction.
@@ -551,33 +1023,48 @@ def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optio
     Args:
         post_node: Dictionary containing post/reel data from API response
         skip_video_url: Deprecated parameter (kept for backward compatibility). Video URLs are always extracted.
+        now: Optional. Current time used to validate timestamps and as the last-resort taken_at.
+             Callers parsing a whole page should compute it once and pass it in. Defaults to timezone.now().
     
     Returns:
         Dictionary with parsed post data, or None if parsing failed
     """
+    if now is None:
+        now = timezone.now()
+    # Latest believable post time for fallback timestamps (allows a day of clock skew)
+    latest_valid_date = now + TIMESTAMP_SKEW
+    
     try:
         # Handle nested media structure (for reels endpoint)
         # Some endpoints return node.media, others return post data directly in node
         # For reels endpoint: data is directly in node (no nested media structure)
         # For posts endpoint: might have nested media structure
-        media_data = {}
-        if "media" in post_node and isinstance(post_node.get("media"), dict):
+        media_data = post_node.get("media")
+        if isinstance(media_data, dict):
             # Extract data from nested media object (posts endpoint structure)
-            media_data = post_node.get("media", {})
-            # Merge media data with node data (media_data takes precedence for overlapping fields)
-            # This ensures play_count from media is available in actual_post_data
+            # Merge media data with node data once (media_data takes precedence for overlapping fields).
+            # actual_post_data is the flattened view used for all lookups below; a plain dict keeps each
+            # .get() below a single C-level lookup
             actual_post_data = {**post_node, **media_data}
-            
-            # Debug: Log play_count extraction for reels
-            if media_data.get("product_type") == "clips" or post_node.get("product_type") == "clips":
-                logger.info(f"Reel parsing DEBUG: Found nested media structure")
-                logger.info(f"Reel parsing DEBUG: media_data keys: {list(media_data.keys())[:20]}")
-                logger.info(f"Reel parsing DEBUG: media_data.play_count = {media_data.get('play_count')}")
-                logger.info(f"Reel parsing DEBUG: actual_post_data.play_count = {actual_post_data.get('play_count')}")
         else:
             # Use node directly (reels endpoint structure - data is directly in node, no nested media)
             actual_post_data = post_node
-            # For reels endpoint, there's no nested media, so media_data stays empty
+            # For reels endpoint, there's no nested media, so media_data is empty
+            media_data = {}
+        
+        # Determine once whether this is a reel; reused by logging, timestamp and URL extraction below
+        # (actual_post_data already carries media_data's product_type when a nested media object exists,
+        # and is post_node itself otherwise, so the node only needs a second look in the nested case)
+        is_reel = actual_post_data.get("product_type") == "clips" or (
+            actual_post_data is not post_node and post_node.get("product_type") == "clips"
+        )
+        
+        # Debug: Log play_count extraction for reels with nested media
+        if media_data and is_reel and logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Reel parsing DEBUG: Found nested media structure")
+            logger.debug("Reel parsing DEBUG: media_data keys: %s", list(media_data.keys())[:20])
+            logger.debug("Reel parsing DEBUG: media_data.play_count = %s", media_data.get('play_count'))
+            logger.debug("Reel parsing DEBUG: actual_post_data.play_count = %s", actual_post_data.get('play_count'))
         
         # Extract post ID (use pk as primary identifier)
         post_id = actual_post_data.get("pk") or actual_post_data.get("id", "")
@@ -587,107 +1074,80 @@ def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optio
         # Extract caption text
         # For reels endpoint: caption is in node.caption.text (caption is a dict with 'text' field)
         # For posts endpoint: caption might be in node.caption.text or directly as node.caption
-        # Check multiple locations to ensure we capture captions for both posts and reels
+        # Check multiple locations to ensure we capture captions for both posts and reels:
+        # post_node.caption (top level of node - where the reels endpoint stores it), then media_data.caption
+        # (nested structure), then the merged data
         caption = ""
-        caption_obj = None
-        
-        # Priority 1: Check post_node.caption (top level of node) - this is where reels endpoint stores it
-        if post_node.get("caption"):
-            caption_obj = post_node.get("caption")
-        # Priority 2: Check media_data.caption (for reels with nested structure)
-        elif media_data and media_data.get("caption"):
-            caption_obj = media_data.get("caption")
-        # Priority 3: Check actual_post_data.caption (merged data)
-        elif actual_post_data.get("caption"):
-            caption_obj = actual_post_data.get("caption")
+        caption_obj = post_node.get("caption") or media_data.get("caption") or actual_post_data.get("caption")
         
         # Extract text from caption object
         # Reels endpoint returns caption as: {"text": "...", "pk": "...", "created_at": ...}
         # Posts endpoint might return caption as string or dict
-        if caption_obj:
-            if isinstance(caption_obj, dict):
-                # Caption is a dict - extract the 'text' field (this is the structure from reels endpoint)
-                caption = caption_obj.get("text", "") or caption_obj.get("caption", "")
-                # If still empty, try to get any string value from the dict
-                if not caption:
-                    for key in ["text", "caption", "content"]:
-                        if key in caption_obj and isinstance(caption_obj[key], str):
-                            caption = caption_obj[key]
-                            break
-            elif isinstance(caption_obj, str):
-                # Sometimes caption is directly a string
-                caption = caption_obj
-        
-        # Log caption extraction for reels to help debug
-        is_reel_check = actual_post_data.get("product_type") == "clips" or post_node.get("product_type") == "clips"
-        if is_reel_check:
+        if isinstance(caption_obj, dict):
+            # Caption is a dict - extract the 'text' field (this is the structure from reels endpoint)
+            caption = caption_obj.get("text") or caption_obj.get("caption") or ""
+            if not caption and isinstance(caption_obj.get("content"), str):
+                caption = caption_obj["content"]
+        elif isinstance(caption_obj, str):
+            # Sometimes caption is directly a string
+            caption = caption_obj
+        
+        # Log caption extraction for reels to help debug (per-reel detail, so DEBUG only: the
+        # core.services logger runs at INFO unless INSTAGRAM_SERVICE_LOG_LEVEL lowers it)
+        if is_reel and logger.isEnabledFor(logging.DEBUG):
             if caption:
-                logger.info(f"Reel {post_id}: Successfully extracted caption (length: {len(caption)}, preview: {caption[:50]}...)")
+                logger.debug("Reel %s: Successfully extracted caption (length: %d, preview: %s...)", post_id, len(caption), caption[:50])
             else:
-                # Enhanced debugging for reels caption extraction
+                # Enhanced debugging for reels caption extraction (many reels legitimately have no caption)
                 caption_debug_info = {
                     "post_node_has_caption": post_node.get("caption") is not None,
                     "post_node_caption_type": type(post_node.get("caption")).__name__ if post_node.get("caption") is not None else None,
-                    "media_data_has_caption": media_data.get("caption") is not None if media_data else False,
+                    "media_data_has_caption": media_data.get("caption") is not None,
                     "actual_post_data_has_caption": actual_post_data.get("caption") is not None,
                 }
-                logger.warning(f"Reel {post_id}: No caption found. Debug info: {caption_debug_info}")
+                logger.debug("Reel %s: No caption found. Debug info: %s", post_id, caption_debug_info)
                 # Log the actual caption structure if it exists
-                if post_node.get("caption"):
-                    logger.debug(f"Reel {post_id}: post_node.caption structure: {type(post_node.get('caption'))}, keys: {list(post_node.get('caption').keys()) if isinstance(post_node.get('caption'), dict) else 'N/A'}")
+                if isinstance(caption_obj, dict):
+                    logger.debug("Reel %s: caption structure: %s, keys: %s", post_id, type(caption_obj), list(caption_obj.keys()))
         
         # Extract timestamp (taken_at is Unix timestamp)
         # For reels endpoint, taken_at is ALWAYS directly in node.taken_at as an integer Unix timestamp
         # Check node first (this is where reels have it), then media, then merged data
         taken_at_timestamp = None
         caption_created_at_timestamp = None
+        # caption.created_at as a datetime, converted at most once (debug print or a future-timestamp fallback)
+        caption_dt = None
         
         # Priority 1: Check node.taken_at directly (this is where reels have it)
-        if post_node.get("taken_at") is not None:
-            taken_at_timestamp = post_node.get("taken_at")
         # Priority 2: Check media object (for nested structures)
-        elif media_data and media_data.get("taken_at") is not None:
-            taken_at_timestamp = media_data.get("taken_at")
-        # Priority 3: Check merged data
-        elif actual_post_data.get("taken_at") is not None:
-            taken_at_timestamp = actual_post_data.get("taken_at")
-        # Priority 4: Check alternative field names
-        elif actual_post_data.get("taken_at_timestamp") is not None:
-            taken_at_timestamp = actual_post_data.get("taken_at_timestamp")
-        elif post_node.get("taken_at_timestamp") is not None:
-            taken_at_timestamp = post_node.get("taken_at_timestamp")
-        elif media_data and media_data.get("taken_at_timestamp") is not None:
-            taken_at_timestamp = media_data.get("taken_at_timestamp")
+        taken_at_timestamp = _first_not_none((post_node, media_data), "taken_at")
+        # Priority 3: Check alternative field names (merged data first; post_node covers a None in media)
+        if taken_at_timestamp is None:
+            taken_at_timestamp = _first_not_none((actual_post_data, post_node), "taken_at_timestamp")
         
         # Also extract caption.created_at as a fallback option for reels
         # This is useful when taken_at is in the future but caption.created_at is in the past
         # Structure: edges -> node -> caption -> created_at
-        # post_node is the "node" object, so we access caption directly from it
-        caption_data = post_node.get("caption") or actual_post_data.get("caption")
-        if caption_data and isinstance(caption_data, dict):
-            caption_created_at = caption_data.get("created_at")
+        # caption_obj was already resolved above (node first, then media / merged data)
+        if isinstance(caption_obj, dict):
+            caption_created_at = caption_obj.get("created_at")
             if caption_created_at is not None:
                 caption_created_at_timestamp = caption_created_at
                 # Log caption.created_at extraction for debugging
-                is_reel_check_temp = actual_post_data.get("product_type") == "clips" or post_node.get("product_type") == "clips"
-                if is_reel_check_temp:
-                    logger.info(f"Reel {post_id}: Found caption.created_at = {caption_created_at_timestamp}")
-            else:
+                if is_reel:
+                    logger.debug("Reel %s: Found caption.created_at = %s", post_id, caption_created_at_timestamp)
+            elif is_reel and logger.isEnabledFor(logging.DEBUG):
                 # Log when caption exists but created_at is missing
-                is_reel_check_temp = actual_post_data.get("product_type") == "clips" or post_node.get("product_type") == "clips"
-                if is_reel_check_temp:
-                    logger.debug(f"Reel {post_id}: Caption object exists but created_at is None. Caption keys: {list(caption_data.keys())}")
-        else:
+                logger.debug("Reel %s: Caption object exists but created_at is None. Caption keys: %s", post_id, list(caption_obj.keys()))
+        elif is_reel:
             # Log when caption is missing
-            is_reel_check_temp = actual_post_data.get("product_type") == "clips" or post_node.get("product_type") == "clips"
-            if is_reel_check_temp:
-                logger.debug(f"Reel {post_id}: No caption object found. post_node has caption: {post_node.get('caption') is not None}, actual_post_data has caption: {actual_post_data.get('caption') is not None}")
+            logger.debug("Reel %s: No caption object found", post_id)
         
-        # Print timestamps for reels to help debug
-        is_reel_check = actual_post_data.get("product_type") == "clips" or post_node.get("product_type") == "clips"
-        if is_reel_check:
+        # Print timestamps for reels to help debug (DEBUG_REEL_TIMESTAMPS only: this runs for every reel parsed)
+        if is_reel and _DEBUG_REEL_TIMESTAMPS:
             print(f"\n=== REEL {post_id} TIMESTAMPS ===")
             print(f"taken_at (raw timestamp): {taken_at_timestamp}")
+            taken_at_dt = None
             if taken_at_timestamp is not None:
                 try:
                     taken_at_dt = datetime.fromtimestamp(float(taken_at_timestamp), tz=timezone.utc)
@@ -696,54 +1156,32 @@ def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optio
                     print(f"taken_at conversion error: {e}")
             print(f"caption.created_at (raw timestamp): {caption_created_at_timestamp}")
             if caption_created_at_timestamp is not None:
-                try:
-                    caption_dt = datetime.fromtimestamp(float(caption_created_at_timestamp), tz=timezone.utc)
+                caption_dt = _caption_created_at_to_datetime(caption_created_at_timestamp)
+                if caption_dt is not None:
                     print(f"caption.created_at (converted): {caption_dt}")
-                    if taken_at_timestamp is not None:
-                        try:
-                            taken_at_dt = datetime.fromtimestamp(float(taken_at_timestamp), tz=timezone.utc)
-                            diff = caption_dt - taken_at_dt
-                            print(f"Difference (caption - taken_at): {diff.total_seconds()} seconds")
-                        except:
-                            pass
-                except Exception as e:
-                    print(f"caption.created_at conversion error: {e}")
+                    if taken_at_dt is not None:
+                        diff = caption_dt - taken_at_dt
+                        print(f"Difference (caption - taken_at): {diff.total_seconds()} seconds")
+                else:
+                    print(f"caption.created_at conversion error: {caption_created_at_timestamp!r}")
             print("=" * 40 + "\n")
         
         # Log for debugging reels timestamp extraction
-        if is_reel_check:
+        if is_reel and _DEBUG_REEL_TIMESTAMPS:
             logger.info(
-                f"Reel {post_id}: taken_at extraction - "
-                f"node.taken_at={post_node.get('taken_at')}, "
-                f"media.taken_at={media_data.get('taken_at') if media_data else 'N/A'}, "
-                f"actual_post_data.taken_at={actual_post_data.get('taken_at')}, "
-                f"final_timestamp={taken_at_timestamp}"
+                "Reel %s: taken_at extraction - node.taken_at=%s, media.taken_at=%s, actual_post_data.taken_at=%s, final_timestamp=%s",
+                post_id, post_node.get('taken_at'), media_data.get('taken_at') if media_data else 'N/A',
+                actual_post_data.get('taken_at'), taken_at_timestamp
             )
         
         # Handle both integer timestamps and string timestamps
         if taken_at_timestamp is not None and taken_at_timestamp != 0:
             try:
-                # If it's already a datetime object, use it directly
-                if isinstance(taken_at_timestamp, datetime):
-                    taken_at = taken_at_timestamp
-                    if taken_at.tzinfo is None:
-                        taken_at = timezone.make_aware(taken_at)
-                # If it's a string, try to parse it
-                elif isinstance(taken_at_timestamp, str):
-                    # Try parsing as ISO format first
-                    try:
-                        taken_at = datetime.fromisoformat(taken_at_timestamp.replace('Z', '+00:00'))
-                        if taken_at.tzinfo is None:
-                            taken_at = timezone.make_aware(taken_at)
-                    except:
-                        # Try parsing as Unix timestamp string
-                        taken_at = datetime.fromtimestamp(float(taken_at_timestamp), tz=timezone.utc)
-                # If it's a number (int or float), treat as Unix timestamp in seconds
-                else:
+                # If it's a number (int or float) - the normal API case, so checked first with a single
+                # isinstance - treat as Unix timestamp in seconds
+                if not isinstance(taken_at_timestamp, (str, datetime)):
                     # Convert to float first to handle both int and float
                     timestamp_float = float(taken_at_timestamp)
-                    now = timezone.now()
-                    instagram_start = datetime(2010, 1, 1, tzinfo=timezone.utc)
                     
                     # Convert timestamp (in seconds) to datetime
                     try:
@@ -752,160 +1190,156 @@ def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optio
                         # Validate the timestamp is reasonable
                         # Allow timestamps up to 1 year in the future (for scheduled posts or timezone differences)
                         # Only reject if it's clearly invalid (before Instagram existed or way too far in future)
-                        max_future_date = now + timedelta(days=365)
-                        
-                        if taken_at < instagram_start:
+                        if INSTAGRAM_START <= taken_at <= now:
+                            # Common case: a past timestamp from after Instagram launched needs no repair
+                            if is_reel:
+                                logger.debug("Successfully parsed timestamp %s -> %s for reel %s", taken_at_timestamp, taken_at, post_id)
+                        elif taken_at < INSTAGRAM_START:
                             # Timestamp is before Instagram existed - extract from post ID
                             logger.warning(
-                                f"Timestamp {taken_at_timestamp} ({taken_at}) is before Instagram existed for reel {post_id}. "
-                                f"Extracting from post ID instead."
+                                "Timestamp %s (%s) is before Instagram existed for reel %s. "
+                                "Extracting from post ID instead.",
+                                taken_at_timestamp, taken_at, post_id
                             )
-                            extracted = _extract_timestamp_from_post_id(post_id)
+                            extracted = _timestamp_from_post_id(post_id, latest_valid_date)
                             # Only use extracted if it's reasonable (not in future)
-                            if extracted and extracted <= now + timedelta(days=1):
+                            if extracted:
                                 taken_at = extracted
-                                if is_reel_check:
-                                    logger.info(f"Used post ID extraction -> {taken_at} for reel {post_id}")
+                                if is_reel:
+                                    logger.debug("Used post ID extraction -> %s for reel %s", taken_at, post_id)
                             else:
                                 # Post ID extraction also failed, use API timestamp anyway (better than current time)
-                                logger.warning(f"Post ID extraction also failed for reel {post_id}, using API timestamp {taken_at}")
-                                if is_reel_check:
-                                    logger.info(f"Using API timestamp despite being before Instagram start: {taken_at}")
-                        elif taken_at > max_future_date:
+                                logger.warning("Post ID extraction also failed for reel %s, using API timestamp %s", post_id, taken_at)
+                                if is_reel:
+                                    logger.debug("Using API timestamp despite being before Instagram start: %s", taken_at)
+                        elif taken_at > now + MAX_FUTURE_TAKEN_AT:
                             # Timestamp is way too far in the future - try caption.created_at first, then post ID extraction
                             logger.warning(
-                                f"Timestamp {taken_at_timestamp} ({taken_at}) is too far in the future (>1 year) for reel {post_id}. "
-                                f"Trying caption.created_at as fallback."
+                                "Timestamp %s (%s) is too far in the future (>1 year) for reel %s. "
+                                "Trying caption.created_at as fallback.",
+                                taken_at_timestamp, taken_at, post_id
                             )
                             
                             # Try caption.created_at first (it's usually very close to taken_at and often in the past)
-                            if caption_created_at_timestamp is not None:
-                                try:
-                                    caption_timestamp_float = float(caption_created_at_timestamp)
-                                    caption_taken_at = datetime.fromtimestamp(caption_timestamp_float, tz=timezone.utc)
-                                    
-                                    # Use caption.created_at if it's in the past (not in future)
-                                    if caption_taken_at <= now + timedelta(days=1):
-                                        taken_at = caption_taken_at
-                                        if is_reel_check:
-                                            logger.info(f"Used caption.created_at ({caption_created_at_timestamp}) -> {taken_at} for reel {post_id}")
-                                    else:
-                                        # caption.created_at is also in future, try post ID extraction
-                                        logger.warning(f"caption.created_at ({caption_taken_at}) is also in future, trying post ID extraction")
-                                        extracted = _extract_timestamp_from_post_id(post_id)
-                                        if extracted and extracted <= now + timedelta(days=1):
-                                            taken_at = extracted
-                                            if is_reel_check:
-                                                logger.info(f"Used post ID extraction -> {taken_at} for reel {post_id}")
-                                        else:
-                                            # Post ID extraction also failed, use caption.created_at anyway (better than taken_at)
-                                            taken_at = caption_taken_at
-                                            logger.warning(f"Post ID extraction failed, using caption.created_at {taken_at} for reel {post_id}")
-                                except (ValueError, OSError, OverflowError) as e:
-                                    logger.warning(f"Error parsing caption.created_at {caption_created_at_timestamp}: {e}. Trying post ID extraction.")
-                                    extracted = _extract_timestamp_from_post_id(post_id)
-                                    if extracted and extracted <= now + timedelta(days=1):
+                            if caption_created_at_timestamp is not None and caption_dt is None:
+                                caption_dt = _caption_created_at_to_datetime(caption_created_at_timestamp)
+                            if caption_dt is not None:
+                                # Use caption.created_at if it's in the past (not in future)
+                                if caption_dt <= latest_valid_date:
+                                    taken_at = caption_dt
+                                    if is_reel:
+                                        logger.debug("Used caption.created_at (%s) -> %s for reel %s", caption_created_at_timestamp, taken_at, post_id)
+                                else:
+                                    # caption.created_at is also in future, try post ID extraction
+                                    logger.warning("caption.created_at (%s) is also in future, trying post ID extraction", caption_dt)
+                                    extracted = _timestamp_from_post_id(post_id, latest_valid_date)
+                                    if extracted:
                                         taken_at = extracted
-                                        if is_reel_check:
-                                            logger.info(f"Used post ID extraction -> {taken_at} for reel {post_id}")
+                                        if is_reel:
+                                            logger.debug("Used post ID extraction -> %s for reel %s", taken_at, post_id)
                                     else:
-                                        # Post ID extraction also failed, use API timestamp anyway
-                                        logger.warning(f"Post ID extraction also failed for reel {post_id}, using API timestamp {taken_at}")
-                                        if is_reel_check:
-                                            logger.info(f"Using API timestamp despite being in future: {taken_at}")
+                                        # Post ID extraction also failed, use caption.created_at anyway (better than taken_at)
+                                        taken_at = caption_dt
+                                        logger.warning("Post ID extraction failed, using caption.created_at %s for reel %s", taken_at, post_id)
                             else:
-                                # No caption.created_at available, try post ID extraction
-                                extracted = _extract_timestamp_from_post_id(post_id)
-                                if extracted and extracted <= now + timedelta(days=1):
+                                # No usable caption.created_at, try post ID extraction
+                                if caption_created_at_timestamp is not None:
+                                    logger.warning("Error parsing caption.created_at %s. Trying post ID extraction.", caption_created_at_timestamp)
+                                extracted = _timestamp_from_post_id(post_id, latest_valid_date)
+                                if extracted:
                                     taken_at = extracted
-                                    if is_reel_check:
-                                        logger.info(f"Used post ID extraction -> {taken_at} for reel {post_id}")
+                                    if is_reel:
+                                        logger.debug("Used post ID extraction -> %s for reel %s", taken_at, post_id)
                                 else:
                                     # Post ID extraction also failed, use API timestamp anyway
-                                    logger.warning(f"Post ID extraction also failed for reel {post_id}, using API timestamp {taken_at}")
-                                    if is_reel_check:
-                                        logger.info(f"Using API timestamp despite being in future: {taken_at}")
+                                    logger.warning("Post ID extraction also failed for reel %s, using API timestamp %s", post_id, taken_at)
+                                    if is_reel:
+                                        logger.debug("Using API timestamp despite being in future: %s", taken_at)
                         else:
-                            # Timestamp is within acceptable range (even if slightly in future, trust the API)
-                            # But for reels, if taken_at is in the future and caption.created_at is in the past, prefer caption.created_at
-                            if is_reel_check and taken_at > now and caption_created_at_timestamp is not None:
-                                try:
-                                    caption_timestamp_float = float(caption_created_at_timestamp)
-                                    caption_taken_at = datetime.fromtimestamp(caption_timestamp_float, tz=timezone.utc)
-                                    
+                            # Timestamp is in the future but within a year (the fast path above took past ones): trust the API
+                            # But for reels, if caption.created_at is in the past, prefer caption.created_at
+                            if is_reel and caption_created_at_timestamp is not None:
+                                if caption_dt is None:
+                                    caption_dt = _caption_created_at_to_datetime(caption_created_at_timestamp)
+                                if caption_dt is not None:
                                     # If caption.created_at is in the past (not future), use it instead
-                                    if caption_taken_at <= now:
-                                        taken_at = caption_taken_at
-                                        logger.info(f"Reel {post_id}: taken_at ({taken_at_timestamp}) was in future, using caption.created_at ({caption_created_at_timestamp}) -> {taken_at}")
+                                    if caption_dt <= now:
+                                        taken_at = caption_dt
+                                        logger.debug("Reel %s: taken_at (%s) was in future, using caption.created_at (%s) -> %s", post_id, taken_at_timestamp, caption_created_at_timestamp, taken_at)
                                     else:
                                         # Both are in future, use taken_at (original)
-                                        if is_reel_check:
-                                            logger.info(f"Successfully parsed timestamp {taken_at_timestamp} -> {taken_at} for reel {post_id}")
-                                except (ValueError, OSError, OverflowError) as e:
+                                        logger.debug("Successfully parsed timestamp %s -> %s for reel %s", taken_at_timestamp, taken_at, post_id)
+                                else:
                                     # Error parsing caption.created_at, use taken_at
-                                    if is_reel_check:
-                                        logger.warning(f"Error parsing caption.created_at for reel {post_id}: {e}. Using taken_at {taken_at}")
+                                    logger.warning("Error parsing caption.created_at %s for reel %s. Using taken_at %s", caption_created_at_timestamp, post_id, taken_at)
                             else:
-                                # Timestamp is valid (even if slightly in future, trust the API)
-                                if is_reel_check:
-                                    logger.info(f"Successfully parsed timestamp {taken_at_timestamp} -> {taken_at} for reel {post_id}")
+                                # Timestamp is only slightly in the future, trust the API
+                                if is_reel:
+                                    logger.debug("Successfully parsed timestamp %s -> %s for reel %s", taken_at_timestamp, taken_at, post_id)
                     except (ValueError, OSError, OverflowError) as e:
-                        logger.warning(f"Error converting timestamp {taken_at_timestamp} to datetime for reel {post_id}: {e}. Extracting from post ID.")
-                        extracted = _extract_timestamp_from_post_id(post_id)
+                        logger.warning("Error converting timestamp %s to datetime for reel %s: %s. Extracting from post ID.", taken_at_timestamp, post_id, e)
+                        extracted = _timestamp_from_post_id(post_id, latest_valid_date)
                         # Only use extracted if it's reasonable (not in future)
-                        if extracted and extracted <= now + timedelta(days=1):
+                        if extracted:
                             taken_at = extracted
-                            if is_reel_check:
-                                logger.info(f"Used post ID extraction -> {taken_at} for reel {post_id}")
+                            if is_reel:
+                                logger.debug("Used post ID extraction -> %s for reel %s", taken_at, post_id)
                         else:
                             # Post ID extraction failed, use current time as last resort
                             taken_at = now
-                            logger.error(f"Both API timestamp and post ID extraction failed for reel {post_id}, using current time")
+                            logger.error("Both API timestamp and post ID extraction failed for reel %s, using current time", post_id)
+                # If it's a string, try to parse it
+                elif isinstance(taken_at_timestamp, str):
+                    # Try parsing as ISO format first
+                    try:
+                        taken_at = datetime.fromisoformat(taken_at_timestamp.replace('Z', '+00:00'))
+                        if taken_at.tzinfo is None:
+                            taken_at = timezone.make_aware(taken_at)
+                    except ValueError:
+                        # Try parsing as Unix timestamp string
+                        taken_at = datetime.fromtimestamp(float(taken_at_timestamp), tz=timezone.utc)
+                # Otherwise it's already a datetime object, use it directly
+                else:
+                    taken_at = taken_at_timestamp
+                    if taken_at.tzinfo is None:
+                        taken_at = timezone.make_aware(taken_at)
             except (ValueError, TypeError, OSError) as e:
-                logger.warning(f"Error parsing timestamp {taken_at_timestamp} for post {post_id}: {e}. Extracting from post ID.")
+                logger.warning("Error parsing timestamp %s for post %s: %s. Extracting from post ID.", taken_at_timestamp, post_id, e)
                 # Fallback: Extract timestamp from Instagram post ID (snowflake ID)
-                extracted = _extract_timestamp_from_post_id(post_id)
+                extracted = _timestamp_from_post_id(post_id, latest_valid_date)
                 if extracted:
                     taken_at = extracted
-                    if is_reel_check:
-                        logger.info(f"Used fallback timestamp extraction for reel {post_id}: {taken_at}")
+                    if is_reel:
+                        logger.debug("Used fallback timestamp extraction for reel %s: %s", post_id, taken_at)
                 else:
                     # Post ID extraction failed, use current time
-                    taken_at = timezone.now()
-                    logger.warning(f"Post ID extraction failed for reel {post_id}, using current time {taken_at}")
-                    if is_reel_check:
-                        logger.warning(f"Using current time as fallback for reel {post_id}: {taken_at}")
+                    taken_at = now
+                    logger.warning("Post ID extraction failed for reel %s, using current time %s", post_id, taken_at)
+                    if is_reel:
+                        logger.warning("Using current time as fallback for reel %s: %s", post_id, taken_at)
         else:
             # If no timestamp found in API response, extract from Instagram post ID (snowflake ID)
             # This should rarely happen for reels as the API provides taken_at directly in the node
-            is_reel_check = actual_post_data.get("product_type") == "clips" or post_node.get("product_type") == "clips"
-            if is_reel_check:
-                logger.warning(
-                    f"No taken_at timestamp found in API response for reel {post_id}. "
-                    f"Available keys in node: {list(post_node.keys())[:20]}. "
-                    f"Extracting from post ID as fallback."
+            if is_reel and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "No taken_at timestamp found in API response for reel %s. "
+                    "Available keys in node: %s. "
+                    "Extracting from post ID as fallback.",
+                    post_id, list(post_node.keys())[:20]
                 )
-            extracted = _extract_timestamp_from_post_id(post_id)
+            extracted = _timestamp_from_post_id(post_id, latest_valid_date)
             
             if extracted:
                 taken_at = extracted
                 # Log the extracted timestamp for verification
-                if is_reel_check:
-                    logger.info(f"Extracted timestamp {taken_at} from post ID {post_id} for reel")
+                if is_reel:
+                    logger.debug("Extracted timestamp %s from post ID %s for reel", taken_at, post_id)
             else:
                 # Post ID extraction failed, use current time as last resort
-                taken_at = timezone.now()
-                logger.warning(f"Post ID extraction failed for reel {post_id}, using current time {taken_at}")
-                if is_reel_check:
-                    logger.warning(f"Using current time as fallback for reel {post_id}: {taken_at}")
-        
-        # Determine if this is a reel (check before extracting play_count so we can log properly)
-        # Check both in actual_post_data (merged) and post_node (original)
-        is_reel = (
-            actual_post_data.get("product_type") == "clips" or 
-            post_node.get("product_type") == "clips" or
-            (media_data and media_data.get("product_type") == "clips")
-        )
+                taken_at = now
+                logger.warning("Post ID extraction failed for reel %s, using current time %s", post_id, taken_at)
+                if is_reel:
+                    logger.warning("Using current time as fallback for reel %s: %s", post_id, taken_at)
         
         # Extract media URLs
         image_url = ""
@@ -913,191 +1347,100 @@ def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optio
         
         # Extract video URLs from API response (video URLs are available in the response)
         # Check for video versions (reels and videos)
-        # Priority 1: Check in post_node first (this is where reels endpoint stores it directly)
-        if "video_versions" in post_node and post_node["video_versions"]:
-            video_versions = post_node["video_versions"]
-            if isinstance(video_versions, list) and len(video_versions) > 0:
-                video_url = video_versions[0].get("url", "")
-                if video_url and is_reel:
-                    logger.debug(f"Reel {post_id}: Found video_url in post_node.video_versions")
-        
-        # Priority 2: Check in actual_post_data (merged data from node and media)
-        if not video_url and "video_versions" in actual_post_data and actual_post_data["video_versions"]:
-            video_versions = actual_post_data["video_versions"]
-            if isinstance(video_versions, list) and len(video_versions) > 0:
-                video_url = video_versions[0].get("url", "")
-                if video_url and is_reel:
-                    logger.debug(f"Reel {post_id}: Found video_url in actual_post_data.video_versions")
-        
-        # Priority 3: Check in media_data (for nested media structure)
-        if not video_url and media_data and "video_versions" in media_data and media_data["video_versions"]:
-            video_versions = media_data["video_versions"]
-            if isinstance(video_versions, list) and len(video_versions) > 0:
+        # Priority: post_node first (this is where reels endpoint stores it directly),
+        # then nested media structure; a source only counts if its first version has a url
+        for source in (post_node, media_data):
+            video_versions = source.get("video_versions")
+            if isinstance(video_versions, list) and video_versions:
                 video_url = video_versions[0].get("url", "")
-                if video_url and is_reel:
-                    logger.debug(f"Reel {post_id}: Found video_url in media_data.video_versions")
+                if video_url:
+                    break
         
-        # Priority 4: For reels, check if there's a direct video_url field
+        # For reels, check if there's a direct video_url field
         if not video_url and is_reel:
-            if "video_url" in actual_post_data and actual_post_data["video_url"]:
-                video_url = actual_post_data["video_url"]
-            elif "video_url" in post_node and post_node["video_url"]:
-                video_url = post_node["video_url"]
-            elif media_data and "video_url" in media_data and media_data["video_url"]:
-                video_url = media_data["video_url"]
-        
-        # Check for image versions
-        if "image_versions2" in actual_post_data:
-            image_versions = actual_post_data["image_versions2"]
-            if isinstance(image_versions, dict) and "candidates" in image_versions:
-                candidates = image_versions["candidates"]
-                if isinstance(candidates, list) and len(candidates) > 0:
-                    image_url = candidates[0].get("url", "")
-        
-        # If no image URL found but there's a video, try to get thumbnail
-        if not image_url and video_url and "image_versions2" in actual_post_data:
-            image_versions = actual_post_data["image_versions2"]
-            if isinstance(image_versions, dict) and "candidates" in image_versions:
-                candidates = image_versions["candidates"]
-                if isinstance(candidates, list) and len(candidates) > 0:
-                    image_url = candidates[0].get("url", "")
+            video_url = _first_present((media_data, post_node), "video_url") or ""
+        
+        # Check for image versions (one .get() per level instead of "in" followed by [])
+        image_versions = actual_post_data.get("image_versions2")
+        if isinstance(image_versions, dict):
+            candidates = image_versions.get("candidates")
+            if isinstance(candidates, list) and candidates:
+                image_url = candidates[0].get("url", "")
         
         # Log video URL extraction for reels
-        if is_reel:
+        if is_reel and logger.isEnabledFor(logging.DEBUG):
             if video_url:
-                logger.info(f"Reel {post_id}: Found video_url: {video_url[:50]}...")
+                logger.debug("Reel %s: Found video_url: %s...", post_id, video_url[:50])
             else:
-                logger.warning(f"Reel {post_id}: No video_url found. Checked video_versions in actual_post_data, post_node, and media_data. Available keys in media_data: {list(media_data.keys())[:20] if media_data else 'N/A'}")
+                logger.debug(
+                    "Reel %s: No video_url found. Checked video_versions in actual_post_data, post_node, and media_data. Available keys in media_data: %s",
+                    post_id, list(media_data.keys())[:20] if media_data else 'N/A'
+                )
         
         # Extract engagement metrics - handle None values explicitly and convert to int
-        def safe_int(value, default=0):
-            """Safely convert value to int, handling None and invalid values."""
-            if value is None:
-                return default
-            try:
-                return int(value)
-            except (ValueError, TypeError):
-                return default
-        
-        like_count = safe_int(actual_post_data.get("like_count"), 0)
-        comment_count = safe_int(actual_post_data.get("comment_count"), 0)
+        like_count = _as_int(actual_post_data.get("like_count"))
+        comment_count = _as_int(actual_post_data.get("comment_count"))
         
         # For reels, extract play_count from various possible locations
         # Reels endpoint structure: data is directly in node (no nested media)
         # Posts endpoint structure: might have nested media with play_count
-        play_count_value = None
-        
-        # Priority 1: Check actual_post_data directly (for reels endpoint - data is directly in node)
-        # This is the most common location for reels endpoint responses
-        if "play_count" in actual_post_data:
-            play_count_in_actual = actual_post_data.get("play_count")
-            if play_count_in_actual is not None:
-                play_count_value = play_count_in_actual
-                logger.info(f"{'Reel' if is_reel else 'Post'} {post_id}: ✓ Found play_count in actual_post_data: {play_count_value}")
-        
-        # Priority 2: Check media_data if it was extracted (for posts endpoint with nested media)
-        if play_count_value is None and media_data and "play_count" in media_data:
-            play_count_in_media = media_data.get("play_count")
-            if play_count_in_media is not None:
-                play_count_value = play_count_in_media
-                logger.info(f"{'Reel' if is_reel else 'Post'} {post_id}: ✓ Found play_count in media_data: {play_count_value}")
-        
-        # Priority 3: Check post_node.media directly (for posts endpoint structure)
-        if play_count_value is None and isinstance(post_node.get("media"), dict):
-            media_obj = post_node.get("media", {})
-            if "play_count" in media_obj:
-                play_count_in_node_media = media_obj.get("play_count")
-                if play_count_in_node_media is not None:
-                    play_count_value = play_count_in_node_media
-                    logger.info(f"{'Reel' if is_reel else 'Post'} {post_id}: ✓ Found play_count in post_node.media: {play_count_value}")
-        
-        # Priority 4: Try other possible locations with alternative field names
+        # Priority 1 & 2: actual_post_data.play_count (it already carries media_data's play_count for the
+        # posts endpoint, or the node's own for the reels endpoint)
+        # Priority 3: alternative field names, then the node's own play_count (when media has None),
+        # then clips_metadata. Straight-line checks; 0 is accepted as valid (some reels might have 0 plays)
+        play_count_value = actual_post_data.get("play_count")
         if play_count_value is None:
-            check_locations = [
-                ("actual_post_data.video_play_count", lambda: actual_post_data.get("video_play_count")),
-                ("actual_post_data.reel_play_count", lambda: actual_post_data.get("reel_play_count")),
-                ("post_node.play_count", lambda: post_node.get("play_count")),
-                ("actual_post_data.clips_metadata.play_count", lambda: actual_post_data.get("clips_metadata", {}).get("play_count") if isinstance(actual_post_data.get("clips_metadata"), dict) else None),
-            ]
-            
-            for location_name, getter_func in check_locations:
-                try:
-                    value = getter_func()
-                    if value is not None:  # Accept 0 as valid (some reels might have 0 plays)
-                        play_count_value = value
-                        if is_reel:
-                            logger.info(f"Reel {post_id}: Found play_count in {location_name}: {value}")
-                        break
-                except Exception as e:
-                    logger.debug(f"Error checking {location_name} for reel {post_id}: {e}")
-        
-        # Priority 5: For reels, if play_count is not found, try view_count as fallback
+            play_count_value = actual_post_data.get("video_play_count")
+            if play_count_value is None:
+                play_count_value = actual_post_data.get("reel_play_count")
+                if play_count_value is None:
+                    play_count_value = post_node.get("play_count")
+                    if play_count_value is None:
+                        clips_metadata = actual_post_data.get("clips_metadata")
+                        if isinstance(clips_metadata, dict):
+                            play_count_value = clips_metadata.get("play_count")
+        if play_count_value is not None:
+            logger.debug("%s %s: Found play_count: %s", 'Reel' if is_reel else 'Post', post_id, play_count_value)
+        
+        # Priority 4: For reels, if play_count is not found, try view_count as fallback
         # Note: Some API responses may have view_count instead of play_count
         if is_reel and play_count_value is None:
             # Try view_count as fallback (it exists in the API response structure)
-            view_count_fallback = (
-                media_data.get("view_count") if media_data else None
-            ) or actual_post_data.get("view_count") or post_node.get("view_count")
+            view_count_fallback = _first_present((media_data, post_node), "view_count")
             if view_count_fallback is not None:
                 play_count_value = view_count_fallback
-                logger.info(f"Reel {post_id}: Using view_count as play_count: {play_count_value}")
-        
-        play_count = safe_int(play_count_value, 0)
-        
-        # Enhanced debug logging for reels with missing play_count
-        if is_reel and play_count == 0:
-            # Check all possible numeric fields that might be play_count
-            all_numeric_fields = {}
-            for key, value in actual_post_data.items():
-                if isinstance(value, (int, float)) and ('play' in key.lower() or 'view' in key.lower() or ('count' in key.lower() and ('play' in key.lower() or 'view' in key.lower()))):
-                    all_numeric_fields[key] = value
-            
-            logger.warning(
-                f"Reel {post_id}: play_count is 0 after extraction. "
-                f"Checked locations: actual_post_data.play_count={actual_post_data.get('play_count')}, "
-                f"media_data.play_count={media_data.get('play_count') if media_data else 'N/A'}, "
-                f"post_node.media.play_count={post_node.get('media', {}).get('play_count') if isinstance(post_node.get('media'), dict) else 'N/A'}, "
-                f"view_count={actual_post_data.get('view_count')}. "
-                f"All play/view related numeric fields: {all_numeric_fields if all_numeric_fields else 'None found'}"
-            )
-        
-        # Debug logging for reels with missing play_count
-        if is_reel and play_count == 0:
-            # Check all numeric fields that might be play_count (focus on 'play' not 'view')
-            all_numeric_fields = {}
-            for key, value in actual_post_data.items():
-                if isinstance(value, (int, float)) and ('play' in key.lower() or ('count' in key.lower() and 'play' in key.lower())):
-                    all_numeric_fields[key] = value
-            
-            if media_data:
-                for key, value in media_data.items():
-                    if isinstance(value, (int, float)) and ('play' in key.lower() or ('count' in key.lower() and 'play' in key.lower())):
-                        all_numeric_fields[f"media.{key}"] = value
-            
-            # Also check nested structures
-            if isinstance(actual_post_data.get("clips_metadata"), dict):
-                for key, value in actual_post_data["clips_metadata"].items():
-                    if isinstance(value, (int, float)) and ('play' in key.lower() or ('count' in key.lower() and 'play' in key.lower())):
-                        all_numeric_fields[f"clips_metadata.{key}"] = value
+                logger.debug("Reel %s: Using view_count as play_count: %s", post_id, play_count_value)
+        
+        play_count = _as_int(play_count_value)
+        
+        # Debug logging for reels with missing play_count (only the known play fields are checked)
+        if is_reel and play_count == 0 and logger.isEnabledFor(logging.DEBUG):
+            clips_metadata = actual_post_data.get("clips_metadata")
+            if not isinstance(clips_metadata, dict):
+                clips_metadata = {}
+            play_fields = {}
+            for prefix, source in (("", actual_post_data), ("media.", media_data), ("clips_metadata.", clips_metadata)):
+                for key in KNOWN_PLAY_FIELDS:
+                    value = source.get(key)
+                    if isinstance(value, (int, float)):
+                        play_fields[f"{prefix}{key}"] = value
             
-            logger.warning(
-                f"Reel {post_id}: play_count is 0. "
-                f"Available numeric fields with 'play': {all_numeric_fields if all_numeric_fields else 'None found'}. "
-                f"Top actual_post_data keys: {list(actual_post_data.keys())[:30]}"
-            )
+            # One structured record (a single JSON string) so log collectors can index the fields
+            logger.debug("reel_zero_play_count %s", _json_for_log({
+                "post_id": str(post_id),
+                "view_count": actual_post_data.get("view_count"),
+                "play_fields": play_fields,
+            }))
         
         # Extract post code (shortcode)
         post_code = actual_post_data.get("code") or ""
         
         # Check if it's a carousel - handle None values explicitly
-        carousel_media_count = safe_int(actual_post_data.get("carousel_media_count"), 0)
-        is_carousel = bool(carousel_media_count > 1)  # Ensure boolean
-        
-        # Ensure all boolean fields are proper booleans (not dicts or other types)
-        is_video_value = bool(video_url) or bool(is_reel)
-        is_reel_value = bool(is_reel)
-        is_carousel_value = bool(is_carousel)
+        carousel_media_count = _as_int(actual_post_data.get("carousel_media_count"))
+        is_carousel = carousel_media_count > 1
         
+        # Posts stay plain dicts: views save them via .get()/[] and the fetch cache copies them with dict().
+        # is_reel and is_carousel are already bools from comparisons, so only is_video needs coercing.
         return {
             "post_id": str(post_id),
             "post_code": post_code,
@@ -1105,16 +1448,16 @@ def parse_instagram_post(post_node: Dict, skip_video_url: bool = False) -> Optio
             "taken_at": taken_at,
             "image_url": image_url,
             "video_url": video_url,
-            "is_video": is_video_value,
-            "is_reel": is_reel_value,
-            "is_carousel": is_carousel_value,
+            "is_video": is_reel or bool(video_url),
+            "is_reel": is_reel,
+            "is_carousel": is_carousel,
             "carousel_media_count": carousel_media_count,
             "like_count": like_count,
             "comment_count": comment_count,
             "play_count": play_count,
         }
     except Exception as e:
-        logger.error(f"Error parsing Instagram post: {e}", exc_info=True)
+        logger.error("Error parsing Instagram post: %s", e, exc_info=True)
         return None
 
 
@@ -1130,16 +1473,10 @@ def _fetch_single_page(username: str, end_cursor: Optional[str] = None) -> Optio
     Returns:
         Dictionary with 'posts', 'end_cursor', 'has_next_page', 'user_id' or None if failed
     """
-    url = "https://instagram120.p.rapidapi.com/api/instagram/posts"
-    payload = {
-        "username": username,
-        "maxId": end_cursor if end_cursor else ""
-    }
-    
-    response_data = _make_api_request(url, payload, method="POST")
+    response_data = _fetch_page_response(_URL_POSTS, username, end_cursor)
     
     if not response_data:
-        logger.error(f"Failed to fetch page for {username} (cursor: {end_cursor})")
+        logger.error("Failed to fetch page for %s (cursor: %s)", username, end_cursor)
         return None
     
     result = {
@@ -1157,25 +1494,16 @@ def _fetch_single_page(username: str, end_cursor: Optional[str] = None) -> Optio
     
     # Extract posts from response
     if "result" in response_data:
+        page_now = timezone.now()
         api_result = response_data["result"]
         if isinstance(api_result, dict):
-            edges = api_result.get("edges", [])
-            if not edges:
-                edges = api_result.get("posts", [])
-                if edges:
-                    edges = [{"node": post} if not isinstance(post, dict) or "node" not in post else post for post in edges]
+            nodes = _page_nodes(api_result, "posts")
             
-            if edges:
-                for edge in edges:
-                    if isinstance(edge, dict):
-                        node = edge.get("node", edge)
-                    else:
-                        node = edge
-                    
-                    if isinstance(node, dict):
-                        parsed_post = parse_instagram_post(node)
-                        if parsed_post:
-                            result['posts'].append(parsed_post)
+            if nodes:
+                for node in nodes:
+                    parsed_post = parse_instagram_post(node, now=page_now)
+                    if parsed_post:
+                        result['posts'].append(parsed_post)
                 
                 # Extract pagination info
                 page_info = api_result.get("page_info", {})
@@ -1189,7 +1517,7 @@ def _fetch_single_page(username: str, end_cursor: Optional[str] = None) -> Optio
                         result['has_next_page'] = bool(result['end_cursor'])
         elif isinstance(api_result, list):
             for post_data in api_result:
-                parsed_post = parse_instagram_post(post_data)
+                parsed_post = parse_instagram_post(post_data, now=page_now)
                 if parsed_post:
                     result['posts'].append(parsed_post)
             result['has_next_page'] = False
@@ -1197,11 +1525,11 @@ def _fetch_single_page(username: str, end_cursor: Optional[str] = None) -> Optio
     return result
 
 
-def get_all_posts_for_username(username: str, max_age_hours: Optional[int] = None, max_pages: Optional[int] = None, save_callback: Optional[callable] = None) -> List[Dict]:
+def iter_all_posts_for_username(username: str, max_age_hours: Optional[int] = None, max_pages: Optional[int] = None, save_callback: Optional[callable] = None) -> Iterator[Dict]:
     """
-    Fetch all posts for a given Instagram username using concurrent pagination.
-    Uses up to 13 API keys concurrently to fetch multiple pages simultaneously.
-    Each page (12 posts) is fetched using a different API key, allowing 13 pages per 4 seconds.
+    Stream posts for a given Instagram username using concurrent pagination.
+    Posts are yielded page by page as soon as each page is parsed, so callers that
+    write straight to the database never hold more than one page of posts in memory.
     
     Args:
         username: Instagram username (without @)
@@ -1209,22 +1537,18 @@ def get_all_posts_for_username(username: str, max_age_hours: Optional[int] = Non
                       If None, fetch all available posts.
         max_pages: Optional. If provided, only fetch up to N pages (1 page = 12 posts).
                   If None, uses TEST_MODE_PAGES_LIMIT from settings or fetches all pages.
-        save_callback: Optional callback function that receives a list of post dictionaries
-                      after each API call. Called as: save_callback(posts_batch)
-                      This allows saving posts incrementally instead of waiting for all posts.
+        save_callback: Optional callback function that receives each page's list of post
+                      dictionaries before they are yielded. Called as: save_callback(posts_batch)
     
-    Returns:
-        List of parsed post dictionaries (all posts fetched, even if saved via callback)
+    Yields:
+        Parsed post dictionaries, newest first
     """
-    from django.conf import settings
-    from queue import Queue
-    
     # Clean username: remove @, trim whitespace, convert to lowercase
     username = str(username).strip().lstrip('@').lower()
     
     if not username:
         logger.error("Empty username provided")
-        return []
+        return
     
     # Get test mode limits from settings
     test_mode_limit = getattr(settings, 'TEST_MODE_POSTS_LIMIT', 600)
@@ -1233,161 +1557,175 @@ def get_all_posts_for_username(username: str, max_age_hours: Optional[int] = Non
     # Use max_pages parameter if provided, otherwise use test_mode_pages_limit
     effective_pages_limit = max_pages if max_pages is not None else test_mode_pages_limit
     
-    if test_mode_limit and test_mode_limit > 0:
-        logger.info(f"Test mode enabled: Fetching only {test_mode_limit} recent posts for {username}")
+    # Whether each limit applies, decided once instead of re-testing the settings values per post and per page
+    has_post_limit = bool(test_mode_limit and test_mode_limit > 0)
+    has_page_limit = bool(effective_pages_limit and effective_pages_limit > 0)
+    
+    if has_post_limit:
+        logger.info("Test mode enabled: Fetching only %s recent posts for %s", test_mode_limit, username)
     else:
-        logger.info(f"Test mode disabled: Fetching all available posts for {username}")
-    if effective_pages_limit and effective_pages_limit > 0:
-        logger.info(f"Page limit: Maximum {effective_pages_limit} pages will be fetched")
+        logger.info("Test mode disabled: Fetching all available posts for %s", username)
+    if has_page_limit:
+        logger.info("Page limit: Maximum %s pages will be fetched", effective_pages_limit)
     
     # Calculate cutoff time if max_age_hours is provided
     cutoff_time = None
     if max_age_hours is not None:
         cutoff_time = timezone.now() - timedelta(hours=max_age_hours)
-        logger.info(f"Fetching posts from last {max_age_hours} hours (cutoff: {cutoff_time})")
+        logger.info("Fetching posts from last %s hours (cutoff: %s)", max_age_hours, cutoff_time)
     else:
-        logger.info(f"Fetching all available posts for {username}")
+        logger.info("Fetching all available posts for %s", username)
     
     # Get number of API keys for concurrent fetching
-    api_keys = getattr(settings, 'RAPIDAPI_KEYS', [])
-    num_api_keys = len(api_keys) if api_keys else 13
+    num_api_keys = len(_API_KEYS)
     max_concurrent_pages = min(num_api_keys, 13)  # Use up to 13 keys concurrently
     
-    all_posts = []
+    posts_count = 0
     user_id = None
     
-    # Queue-based concurrent pagination
-    # Queue stores (end_cursor, page_number) tuples
-    page_queue = Queue()
-    page_queue.put((None, 1))  # Start with first page (no cursor)
+    # Cursor-driven pagination: each page's cursor comes from the previous page,
+    # so pages are queued as (end_cursor, page_number) once their predecessor arrives.
+    # Only the driver (this generator) touches the queue, so a plain deque is enough.
+    page_queue = deque([(None, 1)])  # Start with first page (no cursor)
     
     # Track which pages we've fetched and their results
     fetched_pages = {}  # page_number -> result dict
-    next_page_to_process = 1  # Process pages in order
-    active_fetches = 0  # Track concurrent fetches
+    max_page_fetched = 0  # Highest page number in fetched_pages, kept up to date on insert
     
     # Use ThreadPoolExecutor for concurrent page fetching
     with ThreadPoolExecutor(max_workers=max_concurrent_pages) as executor:
         futures = {}  # future -> (end_cursor, page_number)
         
-        # Submit first page immediately
-        if not page_queue.empty():
-            end_cursor, page_num = page_queue.get()
-            future = executor.submit(_fetch_single_page, username, end_cursor)
-            futures[future] = (end_cursor, page_num)
-            active_fetches += 1
-            logger.debug(f"Submitted fetch for page {page_num} (cursor: {end_cursor})")
-        
-        # Process futures as they complete
-        while futures or not page_queue.empty():
+        while futures or page_queue:
             # Submit new page fetches if we have capacity and pages in queue
-            while not page_queue.empty() and active_fetches < max_concurrent_pages:
-                end_cursor, page_num = page_queue.get()
+            while page_queue and len(futures) < max_concurrent_pages:
+                end_cursor, page_num = page_queue.popleft()
                 future = executor.submit(_fetch_single_page, username, end_cursor)
                 futures[future] = (end_cursor, page_num)
-                active_fetches += 1
-                logger.debug(f"Submitted fetch for page {page_num} (cursor: {end_cursor})")
+                logger.debug("Submitted fetch for page %s (cursor: %s)", page_num, end_cursor)
             
-            # Process completed fetches using as_completed
-            if futures:
-                # Use as_completed with a short timeout to check for completed futures
+            # Block until at least one fetch completes (wakes as soon as it does, no polling)
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                end_cursor, page_num = futures.pop(future)
+                
                 try:
-                    for future in as_completed(futures.keys(), timeout=0.1):
-                        if future not in futures:
-                            continue
-                        end_cursor, page_num = futures.pop(future)
-                        active_fetches -= 1
-                        
-                        try:
-                            page_result = future.result()
-                            
-                            if not page_result:
-                                logger.warning(f"Page {page_num} fetch failed")
-                                continue
-                            
-                            # Store user_id from first page
-                            if not user_id and page_result.get('user_id'):
-                                user_id = page_result.get('user_id')
-                            
-                            # Store page result
-                            fetched_pages[page_num] = page_result
-                            
-                            # Process posts from this page
-                            page_posts = page_result.get('posts', [])
-                            batch_posts = []
-                            reels_count = 0
-                            
-                            for parsed_post in page_posts:
-                                # Check test mode limit
-                                if test_mode_limit and test_mode_limit > 0 and len(all_posts) >= test_mode_limit:
-                                    logger.info(f"Reached test mode limit of {test_mode_limit} posts")
-                                    break
-                                
-                                if parsed_post.get("is_reel"):
-                                    reels_count += 1
-                                
-                                # Check time cutoff
-                                if cutoff_time is not None:
-                                    if parsed_post.get("taken_at") and parsed_post["taken_at"] < cutoff_time:
-                                        logger.info(f"Reached posts older than {max_age_hours} hours")
-                                        break
-                                
-                                all_posts.append(parsed_post)
-                                batch_posts.append(parsed_post)
-                            
-                            # Save batch via callback
-                            if save_callback and batch_posts:
-                                try:
-                                    save_callback(batch_posts)
-                                    logger.info(f"Saved {len(batch_posts)} posts from page {page_num}")
-                                except Exception as e:
-                                    logger.error(f"Error in save_callback for page {page_num}: {e}", exc_info=True)
-                            
-                            logger.info(f"Page {page_num}: Fetched {len(batch_posts)} posts ({len(batch_posts) - reels_count} posts, {reels_count} reels)")
-                            
-                            # If there's a next page, add it to queue
-                            if page_result.get('has_next_page') and page_result.get('end_cursor'):
-                                next_cursor = page_result.get('end_cursor')
-                                next_page = page_num + 1
-                                
-                                # Check page limit before queuing
-                                if effective_pages_limit and effective_pages_limit > 0 and next_page > effective_pages_limit:
-                                    logger.info(f"Reached page limit of {effective_pages_limit} pages, stopping pagination")
-                                    break
-                                
-                                page_queue.put((next_cursor, next_page))
-                                logger.debug(f"Queued page {next_page} with cursor {next_cursor}")
-                            
-                            # Check if we should stop
-                            if test_mode_limit and test_mode_limit > 0 and len(all_posts) >= test_mode_limit:
-                                logger.info(f"Reached test mode post limit of {test_mode_limit} posts, stopping pagination")
-                                break
-                            if cutoff_time and any(p.get("taken_at") and p["taken_at"] < cutoff_time for p in batch_posts):
-                                logger.info(f"Reached time cutoff, stopping pagination")
+                    page_result = future.result()
+                    
+                    if not page_result:
+                        logger.warning("Page %s fetch failed", page_num)
+                        continue
+                    
+                    # Store user_id from first page
+                    if not user_id and page_result.get('user_id'):
+                        user_id = page_result.get('user_id')
+                    
+                    # Store page result
+                    fetched_pages[page_num] = page_result
+                    if page_num > max_page_fetched:
+                        max_page_fetched = page_num
+                    
+                    # Process posts from this page: the batch is the leading run of posts that fits
+                    # the test mode limit and is newer than the cutoff, taken as one slice.
+                    # Pages only hold parse_instagram_post results, so taken_at and is_reel are always set.
+                    page_posts = page_result.get('posts', [])
+                    batch_end = len(page_posts)
+                    hit_cutoff = False
+                    
+                    # Check test mode limit
+                    if has_post_limit and posts_count + batch_end > test_mode_limit:
+                        batch_end = max(test_mode_limit - posts_count, 0)
+                        logger.info("Reached test mode limit of %s posts", test_mode_limit)
+                    
+                    # Check time cutoff
+                    if cutoff_time is not None:
+                        for index in range(batch_end):
+                            taken_at = page_posts[index]["taken_at"]
+                            if taken_at and taken_at < cutoff_time:
+                                logger.info("Reached posts older than %s hours", max_age_hours)
+                                hit_cutoff = True
+                                batch_end = index
                                 break
-                                
+                    
+                    batch_posts = page_posts[:batch_end]
+                    posts_count += batch_end
+                    reels_count = sum(parsed_post["is_reel"] for parsed_post in batch_posts)
+                    
+                    # Save batch via callback
+                    if save_callback and batch_posts:
+                        try:
+                            save_callback(batch_posts)
+                            logger.info("Saved %s posts from page %s", len(batch_posts), page_num)
                         except Exception as e:
-                            logger.error(f"Error processing page {page_num}: {e}", exc_info=True)
-                except TimeoutError:
-                    # No futures completed within timeout, continue loop
-                    pass
-                
-                # Check if we should stop
-                if test_mode_limit and test_mode_limit > 0 and len(all_posts) >= test_mode_limit:
-                    logger.info(f"Reached test mode post limit of {test_mode_limit} posts, stopping")
-                    break
-                # Check page limit
-                max_page_fetched = max(fetched_pages.keys()) if fetched_pages else 0
-                if effective_pages_limit and effective_pages_limit > 0 and max_page_fetched >= effective_pages_limit:
-                    logger.info(f"Reached page limit of {effective_pages_limit} pages, stopping")
-                    break
-                
-                # Small sleep to avoid busy waiting
-                if not page_queue.empty() or active_fetches > 0:
-                    time.sleep(0.1)
+                            logger.error("Error in save_callback for page %s: %s", page_num, e, exc_info=True)
+                    
+                    logger.info("Page %s: Fetched %s posts (%s posts, %s reels)", page_num, len(batch_posts), len(batch_posts) - reels_count, reels_count)
+                    
+                    yield from batch_posts
+                    
+                    # Check if we should stop (before queuing, so no further page is fetched)
+                    if has_post_limit and posts_count >= test_mode_limit:
+                        logger.info("Reached test mode post limit of %s posts, stopping pagination", test_mode_limit)
+                        break
+                    if hit_cutoff:
+                        logger.info("Reached time cutoff, stopping pagination")
+                        break
+                    
+                    # If there's a next page, add it to queue
+                    if page_result.get('has_next_page') and page_result.get('end_cursor'):
+                        next_cursor = page_result.get('end_cursor')
+                        next_page = page_num + 1
+                        
+                        # Check page limit before queuing
+                        if has_page_limit and next_page > effective_pages_limit:
+                            logger.info("Reached page limit of %s pages, stopping pagination", effective_pages_limit)
+                            break
+                        
+                        page_queue.append((next_cursor, next_page))
+                        logger.debug("Queued page %s with cursor %s", next_page, next_cursor)
+                        
+                except Exception as e:
+                    logger.error("Error processing page %s: %s", page_num, e, exc_info=True)
+            
+            # Check if we should stop
+            if has_post_limit and posts_count >= test_mode_limit:
+                logger.info("Reached test mode post limit of %s posts, stopping", test_mode_limit)
+                break
+            # Check page limit
+            if has_page_limit and max_page_fetched >= effective_pages_limit:
+                logger.info("Reached page limit of %s pages, stopping", effective_pages_limit)
+                break
     
-    logger.info(f"Fetched {len(all_posts)} posts for {username} using concurrent pagination")
-    return all_posts
+    logger.info("Fetched %s posts for %s using concurrent pagination", posts_count, username)
+
+
+def get_all_posts_for_username(username: str, max_age_hours: Optional[int] = None, max_pages: Optional[int] = None, save_callback: Optional[callable] = None) -> List[Dict]:
+    """
+    Fetch all posts for a given Instagram username using concurrent pagination.
+    Uses up to 13 API keys concurrently to fetch multiple pages simultaneously.
+    Each page (12 posts) is fetched using a different API key, allowing 13 pages per 4 seconds.
+    
+    Args:
+        username: Instagram username (without @)
+        max_age_hours: Optional. If provided, only fetch posts from the last N hours.
+                      If None, fetch all available posts.
+        max_pages: Optional. If provided, only fetch up to N pages (1 page = 12 posts).
+                  If None, uses TEST_MODE_PAGES_LIMIT from settings or fetches all pages.
+        save_callback: Optional callback function that receives a list of post dictionaries
+                      after each API call. Called as: save_callback(posts_batch)
+                      This allows saving posts incrementally instead of waiting for all posts.
+    
+    Returns:
+        List of parsed post dictionaries (all posts fetched, even if saved via callback)
+    """
+    # Clean username: remove @, trim whitespace, convert to lowercase
+    username = str(username).strip().lstrip('@').lower()
+    
+    if not username:
+        logger.error("Empty username provided")
+        return []
+    
+    return list(iter_all_posts_for_username(username, max_age_hours=max_age_hours, max_pages=max_pages, save_callback=save_callback))
 
 
 def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int] = None) -> Dict[str, int]:
@@ -1412,42 +1750,43 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
     play_count_lookup = {'post_id_map': {}, 'post_code_map': {}}
     end_cursor = None
     has_next_page = True
-    consecutive_429_errors = 0
-    max_429_errors = 3  # Stop after 3 consecutive 429 errors
+    consecutive_failures = 0
+    max_failures = 3  # Stop after 3 consecutive failed page requests
     
     # Calculate cutoff time if max_age_hours is provided
     cutoff_time = None
     if max_age_hours is not None:
         cutoff_time = timezone.now() - timedelta(hours=max_age_hours)
-        logger.info(f"Fetching play_count data from reels endpoint (last {max_age_hours} hours)")
+        logger.info("Fetching play_count data from reels endpoint (last %s hours)", max_age_hours)
     else:
-        logger.info(f"Fetching play_count data from reels endpoint for {username}")
+        logger.info("Fetching play_count data from reels endpoint for %s", username)
     
     while has_next_page:
-        url = "https://instagram120.p.rapidapi.com/api/instagram/reels"
-        payload = {
-            "username": username,
-            "maxId": end_cursor if end_cursor else ""
-        }
-        
-        response_data = _make_api_request(url, payload, method="POST")
+        response_data = _fetch_page_response(_URL_REELS, username, end_cursor)
         
         if not response_data:
-            # Check if this was a 429 error (rate limit)
-            # The _make_api_request logs 429 errors, so we can infer from consecutive failures
-            consecutive_429_errors += 1
-            if consecutive_429_errors >= max_429_errors:
-                logger.error(f"Reels endpoint returned {max_429_errors} consecutive rate limit errors for {username}. Skipping reels endpoint and using fallback extraction.")
+            failure_status = _last_request_failure_status()
+            if failure_status in (401, 403, 404):
+                # Missing user, forbidden profile or rejected keys: retrying the same page won't help
+                logger.error("Reels endpoint request failed with %s for %s. Skipping reels endpoint and using fallback extraction.", failure_status, username)
+                break
+            consecutive_failures += 1
+            if consecutive_failures >= max_failures:
+                logger.error("Reels endpoint failed %s consecutive times for %s. Skipping reels endpoint and using fallback extraction.", max_failures, username)
                 break
+            if failure_status == 429:
+                # No sleep here: _make_api_request has already cooled down the keys that returned 429,
+                # so the retry goes to the key whose rate-limit slot opens soonest and waits only that long
+                logger.warning("Reels endpoint rate limited (attempt %s/%s) for %s, retrying...", consecutive_failures, max_failures, username)
             else:
-                logger.warning(f"Reels endpoint request failed (attempt {consecutive_429_errors}/{max_429_errors}) for {username}, retrying with delay...")
-                # Exponential backoff: wait longer after each 429 error
-                wait_time = min(2 ** consecutive_429_errors * 5, 60)  # 5s, 10s, 20s, max 60s
+                # Server or network error: back off before trying again
+                wait_time = min(2 ** consecutive_failures * 5, 60)  # 10s, 20s, max 60s
+                logger.warning("Reels endpoint request failed (attempt %s/%s) for %s, retrying in %s seconds...", consecutive_failures, max_failures, username, wait_time)
                 time.sleep(wait_time)
-                continue
+            continue
         
         # Reset consecutive error counter on success
-        consecutive_429_errors = 0
+        consecutive_failures = 0
         
         # No delay needed - rate limiter ensures 4-second spacing between requests per API key
         # Rate limiter will handle proper spacing automatically
@@ -1456,22 +1795,10 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
         if "result" in response_data:
             result = response_data["result"]
             if isinstance(result, dict):
-                edges = result.get("edges", [])
-                if not edges:
-                    edges = result.get("reels", [])
-                    if edges:
-                        edges = [{"node": reel} if not isinstance(reel, dict) or "node" not in reel else reel for reel in edges]
+                nodes = _page_nodes(result, "reels")
                 
-                if edges:
-                    for edge in edges:
-                        if isinstance(edge, dict):
-                            node = edge.get("node", edge)
-                        else:
-                            node = edge
-                        
-                        if not isinstance(node, dict):
-                            continue
-                        
+                if nodes:
+                    for node in nodes:
                         # Check if this is a reel (product_type == "clips")
                         if node.get("product_type") != "clips":
                             continue
@@ -1480,49 +1807,8 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
                         post_id = str(node.get("pk") or node.get("id", ""))
                         post_code = node.get("code", "")
                         
-                        # Extract play_count from reels endpoint
-                        # Check multiple locations as the structure may vary
-                        play_count = None
-                        
-                        # Priority 1: Check node directly (most common location)
-                        if "play_count" in node:
-                            play_count = node.get("play_count")
-                        elif "view_count" in node:
-                            view_count = node.get("view_count")
-                            if view_count is not None:
-                                play_count = view_count
-                        
-                        # Priority 2: Check nested media if it exists
-                        if play_count is None and "media" in node and isinstance(node["media"], dict):
-                            media = node["media"]
-                            if "play_count" in media:
-                                play_count = media.get("play_count")
-                            elif "view_count" in media:
-                                view_count = media.get("view_count")
-                                if view_count is not None:
-                                    play_count = view_count
-                        
-                        # Priority 3: Check clips_metadata (some APIs store metrics here)
-                        if play_count is None and "clips_metadata" in node and isinstance(node["clips_metadata"], dict):
-                            clips_meta = node["clips_metadata"]
-                            if "play_count" in clips_meta:
-                                play_count = clips_meta.get("play_count")
-                            elif "view_count" in clips_meta:
-                                view_count = clips_meta.get("view_count")
-                                if view_count is not None:
-                                    play_count = view_count
-                        
-                        # Priority 4: Search for any field with 'play' or 'view' in name that has a numeric value
-                        if play_count is None:
-                            for key, value in node.items():
-                                if isinstance(value, (int, float)) and value is not None:
-                                    if 'play' in key.lower() and 'count' in key.lower():
-                                        play_count = value
-                                        logger.debug(f"Found play_count in field '{key}': {value}")
-                                        break
-                                    elif 'view' in key.lower() and 'count' in key.lower() and play_count is None:
-                                        play_count = value
-                                        logger.debug(f"Found view_count in field '{key}': {value}")
+                        # Extract play_count from reels endpoint (node, media, clips_metadata, then other known fields)
+                        play_count = _reels_node_play_count(node)
                         
                         # Store play_count if found
                         if play_count is not None:
@@ -1532,9 +1818,9 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
                                     play_count_lookup['post_id_map'][post_id] = play_count_int
                                 if post_code:
                                     play_count_lookup['post_code_map'][post_code] = play_count_int
-                                logger.debug(f"Extracted play_count {play_count_int} for reel {post_id} ({post_code}) from reels endpoint")
+                                logger.debug("Extracted play_count %s for reel %s (%s) from reels endpoint", play_count_int, post_id, post_code)
                             except (ValueError, TypeError):
-                                logger.warning(f"Invalid play_count value {play_count} for reel {post_id}")
+                                logger.warning("Invalid play_count value %s for reel %s", play_count, post_id)
                         
                         # Check time cutoff if specified
                         if cutoff_time is not None:
@@ -1543,7 +1829,7 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
                                 try:
                                     taken_at = datetime.fromtimestamp(taken_at_timestamp, tz=timezone.utc)
                                     if taken_at < cutoff_time:
-                                        logger.info(f"Reached reels older than {max_age_hours} hours in reels endpoint, stopping")
+                                        logger.info("Reached reels older than %s hours in reels endpoint, stopping", max_age_hours)
                                         has_next_page = False
                                         break
                                 except (ValueError, OSError, OverflowError):
@@ -1560,7 +1846,7 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
                         if not has_next_page:
                             has_next_page = bool(end_cursor)
                 else:
-                    logger.warning(f"No reels found in reels endpoint response for {username}")
+                    logger.warning("No reels found in reels endpoint response for %s", username)
                     has_next_page = False
             elif isinstance(result, list):
                 # Handle direct list format
@@ -1578,16 +1864,16 @@ def _fetch_reels_from_reels_endpoint(username: str, max_age_hours: Optional[int]
                                 pass
                 has_next_page = False
             else:
-                logger.warning(f"Unexpected result format in reels endpoint for {username}: {type(result)}")
+                logger.warning("Unexpected result format in reels endpoint for %s: %s", username, type(result))
                 has_next_page = False
         else:
-            logger.error(f"No 'result' key in reels endpoint response for {username}")
+            logger.error("No 'result' key in reels endpoint response for %s", username)
             has_next_page = False
         
         # No delay needed - rate limiter ensures 4-second spacing between requests per API key
     
     total_play_counts = len(play_count_lookup['post_id_map']) + len(play_count_lookup['post_code_map'])
-    logger.info(f"Fetched play_count data for {total_play_counts} reels from reels endpoint for {username}")
+    logger.info("Fetched play_count data for %s reels from reels endpoint for %s", total_play_counts, username)
     return play_count_lookup
 
 
@@ -1611,109 +1897,98 @@ def fetch_instagram_reels(username: str, max_age_hours: Optional[int] = None) ->
         logger.error("Empty username provided")
         return []
     
+    cache_key = ("reels", username, max_age_hours)
+    cached_reels = _get_cached_posts(cache_key)
+    if cached_reels is not None:
+        logger.info("Using cached reels for %s (%s reels)", username, len(cached_reels))
+        return cached_reels
+    
     all_reels = []
     end_cursor = None
     has_next_page = True
     
     # Check for test mode limit from settings
-    from django.conf import settings
     test_mode_limit = getattr(settings, 'TEST_MODE_REELS_LIMIT', None)
     
     # Calculate cutoff time if max_age_hours is provided
     cutoff_time = None
     if max_age_hours is not None:
         cutoff_time = timezone.now() - timedelta(hours=max_age_hours)
-        logger.info(f"Fetching reels from reels endpoint (last {max_age_hours} hours)")
+        logger.info("Fetching reels from reels endpoint (last %s hours)", max_age_hours)
     else:
-        logger.info(f"Fetching all available reels from reels endpoint for {username}")
+        logger.info("Fetching all available reels from reels endpoint for %s", username)
     
     # Log test mode status
     if test_mode_limit:
-        logger.info(f"TEST MODE: Limiting reel fetch to {test_mode_limit} most recent reels")
+        logger.info("TEST MODE: Limiting reel fetch to %s most recent reels", test_mode_limit)
     
     while has_next_page:
         # Use ONLY the reels endpoint - posts should be fetched separately
-        url = "https://instagram120.p.rapidapi.com/api/instagram/reels"
-        payload = {
-            "username": username,
-            "maxId": end_cursor if end_cursor else ""
-        }
-        
-        response_data = _make_api_request(url, payload, method="POST")
+        response_data = _fetch_page_response(_URL_REELS, username, end_cursor)
         
         # Also try the reel detail endpoint to get view counts if available
         # Note: This might require individual API calls per reel, which could be rate-limited
         
         if not response_data:
-            logger.error(f"Failed to fetch reels for {username}")
+            logger.error("Failed to fetch reels for %s", username)
             break
         
         # Extract reels from response - handle different response formats
         if "result" in response_data:
+            page_now = timezone.now()
             result = response_data["result"]
             if isinstance(result, dict):
-                # Check for edges (GraphQL-style response)
-                edges = result.get("edges", [])
-                if not edges:
-                    # Try alternative format
-                    edges = result.get("reels", [])
-                    if edges:
-                        edges = [{"node": reel} if not isinstance(reel, dict) or "node" not in reel else reel for reel in edges]
+                # Edges (GraphQL-style response) or the alternative "reels" list, unwrapped to nodes
+                nodes = _page_nodes(result, "reels")
                 
-                if edges:
-                    for edge in edges:
-                        # Handle both edge format and direct node format
-                        if isinstance(edge, dict):
-                            node = edge.get("node", edge)
-                        else:
-                            node = edge
-                        
-                        if not isinstance(node, dict):
+                if nodes:
+                    # Reels missing play_count, resolved together after this page is parsed
+                    pending_play_counts = []
+                    
+                    for node in nodes:
+                        # Only include reels: skip other items before paying for a full parse
+                        if not _is_reel_node(node):
                             continue
                         
                         # Parse the reel
-                        parsed_reel = parse_instagram_post(node)
+                        parsed_reel = parse_instagram_post(node, now=page_now)
                         
-                        # Only include reels (filter by product_type or is_reel flag)
-                        if parsed_reel and parsed_reel.get("is_reel"):
-                            # Ensure is_reel is set to True
-                            parsed_reel["is_reel"] = True
+                        if parsed_reel:
+                            # If max_age_hours is set, check if reel is within time window before doing
+                            # any further work (old reels must not trigger post detail lookups)
+                            if cutoff_time is not None:
+                                if parsed_reel.get("taken_at") and parsed_reel["taken_at"] < cutoff_time:
+                                    # Reel is too old, stop pagination (reels are returned newest first)
+                                    logger.info("Reached reels older than %s hours, stopping pagination", max_age_hours)
+                                    has_next_page = False
+                                    break
                             
                             # Play count should be extracted from the reels endpoint response
                             # Skip fallback API calls in test mode for speed optimization
                             post_id = parsed_reel.get("post_id", "")
                             post_code = parsed_reel.get("post_code", "")
                             
-                            # Fallback: If no play_count from reels endpoint, try post detail endpoint
+                            # Fallback: If no play_count from reels endpoint, queue a post detail lookup
                             # SKIP in test mode to avoid slow individual API calls
                             if not test_mode_limit and parsed_reel.get("play_count", 0) == 0 and post_code:
-                                logger.debug(f"Reel {post_id} has no play_count from reels endpoint, trying post detail endpoint")
-                                play_count = _fetch_reel_play_count(post_code)
-                                if play_count is not None and play_count > 0:
-                                    parsed_reel["play_count"] = play_count
-                                    logger.info(f"Fetched play_count {play_count} from post detail endpoint for reel {post_id}")
+                                pending_play_counts.append(parsed_reel)
                             
                             # Video URL will be fetched lazily when user views the post detail page
                             # This reduces initial API calls and improves performance
-                            logger.debug(f"Reel {post_id}: play_count={parsed_reel.get('play_count')}, video_url=Lazy load, post_code={post_code}")
-                            
-                            # If max_age_hours is set, check if reel is within time window
-                            if cutoff_time is not None:
-                                if parsed_reel.get("taken_at") and parsed_reel["taken_at"] < cutoff_time:
-                                    # Reel is too old, stop pagination (reels are returned newest first)
-                                    logger.info(f"Reached reels older than {max_age_hours} hours, stopping pagination")
-                                    has_next_page = False
-                                    break
+                            logger.debug("Reel %s: play_count=%s, video_url=Lazy load, post_code=%s", post_id, parsed_reel.get('play_count'), post_code)
                             
                             all_reels.append(parsed_reel)
                             
                             # Check test mode limit: stop immediately after reaching limit
                             # This prevents processing remaining reels in the current response
                             if test_mode_limit and len(all_reels) >= test_mode_limit:
-                                logger.info(f"TEST MODE: Reached limit of {test_mode_limit} reels, stopping immediately")
+                                logger.info("TEST MODE: Reached limit of %s reels, stopping immediately", test_mode_limit)
                                 has_next_page = False
                                 break
                     
+                    if pending_play_counts:
+                        _fill_missing_play_counts(pending_play_counts)
+                    
                     # Check for pagination - handle different pagination formats
                     # Skip pagination check if we've reached test mode limit
                     if test_mode_limit and len(all_reels) >= test_mode_limit:
@@ -1730,34 +2005,34 @@ def fetch_instagram_reels(username: str, max_age_hours: Optional[int] = None) ->
                             if not has_next_page:
                                 has_next_page = bool(end_cursor)
                 else:
-                    logger.warning(f"No reels found in response for {username}. Response keys: {list(result.keys())}")
+                    logger.warning("No reels found in response for %s. Response keys: %s", username, list(result.keys()))
                     has_next_page = False
             elif isinstance(result, list):
                 # Handle direct list of reels
                 for reel_data in result:
-                    parsed_reel = parse_instagram_post(reel_data)
+                    parsed_reel = parse_instagram_post(reel_data, now=page_now)
                     if parsed_reel:
                         parsed_reel["is_reel"] = True
                         # If max_age_hours is set, check if reel is within time window
                         if cutoff_time is not None:
                             if parsed_reel.get("taken_at") and parsed_reel["taken_at"] < cutoff_time:
                                 # Reel is too old, stop processing
-                                logger.info(f"Reached reels older than {max_age_hours} hours, stopping")
+                                logger.info("Reached reels older than %s hours, stopping", max_age_hours)
                                 has_next_page = False
                                 break
                         all_reels.append(parsed_reel)
                         
                         # Check test mode limit: stop fetching if we've reached the limit
                         if test_mode_limit and len(all_reels) >= test_mode_limit:
-                            logger.info(f"TEST MODE: Reached limit of {test_mode_limit} reels, stopping fetch")
+                            logger.info("TEST MODE: Reached limit of %s reels, stopping fetch", test_mode_limit)
                             has_next_page = False
                             break
                 has_next_page = False
             else:
-                logger.warning(f"Unexpected result format for reels {username}: {type(result)}")
+                logger.warning("Unexpected result format for reels %s: %s", username, type(result))
                 has_next_page = False
         else:
-            logger.error(f"No 'result' key in API response for reels {username}. Response keys: {list(response_data.keys())}")
+            logger.error("No 'result' key in API response for reels %s. Response keys: %s", username, list(response_data.keys()))
             has_next_page = False
         
         # No delay needed - rate limiter ensures 4-second spacing between requests per API key
@@ -1766,13 +2041,15 @@ def fetch_instagram_reels(username: str, max_age_hours: Optional[int] = None) ->
     
     # Apply test mode limit to final results if needed (safety check)
     if test_mode_limit and len(all_reels) > test_mode_limit:
-        logger.info(f"TEST MODE: Truncating results from {len(all_reels)} to {test_mode_limit} reels")
+        logger.info("TEST MODE: Truncating results from %s to %s reels", len(all_reels), test_mode_limit)
         all_reels = all_reels[:test_mode_limit]
     
     # Log summary of results
     merged_count = sum(1 for reel in all_reels if reel.get("play_count", 0) > 0)
     video_count = sum(1 for reel in all_reels if reel.get("video_url"))
-    logger.info(f"Fetched {len(all_reels)} reels for {username}: {merged_count} with play_count, {video_count} with video_url")
+    logger.info("Fetched %s reels for %s: %s with play_count, %s with video_url", len(all_reels), username, merged_count, video_count)
+    
+    _set_cached_posts(cache_key, all_reels)
     
     return all_reels
 
@@ -1792,63 +2069,185 @@ def get_all_reels_for_username(username: str, max_age_hours: Optional[int] = Non
     return fetch_instagram_reels(username, max_age_hours=max_age_hours)
 
 
-def fetch_reels_for_accounts(accounts: List) -> Dict:
+class ReelFetchResult:
     """
-    Fetch reels for multiple accounts concurrently using ThreadPoolExecutor.
-    Uses all available API keys to maximize throughput (10 calls/sec total with 5 keys).
+    Outcome of fetching reels for one account in fetch_reels_for_accounts.
+    
+    Attributes:
+        reels: List of parsed reel dictionaries (empty on error)
+        error: Error message, or None if the fetch succeeded
+        account: The InstagramAccount the reels belong to
+    """
+    __slots__ = ("reels", "error", "account")
+    
+    def __init__(self, reels: List[Dict], error: Optional[str], account):
+        self.reels = reels
+        self.error = error
+        self.account = account
+    
+    @classmethod
+    def empty(cls, account, error: str) -> "ReelFetchResult":
+        """Result for an account whose fetch failed."""
+        return cls([], error, account)
+
+
+class _AccountDeque:
+    """
+    Work deque owned by one worker in fetch_reels_for_accounts.
+    Items are groups of accounts sharing a username (one fetch each).
+    Used strictly FIFO by its owner: items are appended at the tail and the owner pops from the head,
+    so each worker processes its work in submission order. Idle workers steal from the tail
+    (the most recently queued items), so owner and thieves rarely contend for the same end.
+    """
+    __slots__ = ("items", "lock")
+    
+    def __init__(self):
+        self.items = deque()
+        self.lock = Lock()
+    
+    def pop_head(self):
+        """Take the next item for the owning worker, or None if empty."""
+        with self.lock:
+            return self.items.popleft() if self.items else None
+    
+    def steal_half(self) -> List:
+        """
+        Take the back half of the deque (at least one item) for another worker.
+        Stealing in batches means a thief takes the victim's lock once per batch, not once per item.
+        Returned items keep their queue order.
+        """
+        with self.lock:
+            count = max(1, len(self.items) // 2) if self.items else 0
+            stolen = [self.items.pop() for _ in range(count)]
+        stolen.reverse()
+        return stolen
+    
+    def extend(self, items: List):
+        """Append items to the tail of the deque."""
+        with self.lock:
+            self.items.extend(items)
+
+
+def fetch_reels_for_accounts(accounts: List) -> Dict[int, ReelFetchResult]:
+    """
+    Fetch reels for multiple accounts concurrently.
+    Accounts tracking the same Instagram username (e.g. added by different users) are fetched once
+    and share the result.
+    Usernames are dealt round-robin into one work deque per worker (one worker per configured API key);
+    a worker that runs out of work steals half of a busier worker's deque from the tail.
+    All workers share the per-key rate limiter, so the combined request budget is spread across every account.
     
     Args:
         accounts: List of InstagramAccount model instances
     
     Returns:
-        Dictionary mapping account IDs to lists of reel data
+        Dictionary mapping every account ID to a ReelFetchResult (attributes reels, error and account).
+        These replace the earlier {'reels', 'error', 'account'} dicts, so read them with attribute access.
+        A failed fetch still gets an entry: ReelFetchResult.empty(account, error).
     """
-    results = {}
+    if not accounts:
+        return {}
+    
+    # Pre-populate one slot per account so inserts below only overwrite (no dict resizes mid-run)
+    results = dict.fromkeys(account.id for account in accounts)
     
-    def fetch_reels_for_account(account):
-        """Helper function to fetch reels for a single account."""
+    def fetch_reels_for_group(group):
+        """Helper function to fetch reels once for a group of accounts sharing a username."""
+        username = group[0].username
         try:
-            reels = get_all_reels_for_username(account.username)
-            return account.id, reels, None
+            return get_all_reels_for_username(username), None
         except Exception as e:
-            logger.error(f"Error fetching reels for {account.username}: {e}", exc_info=True)
-            return account.id, [], str(e)
-    
-    # Use ThreadPoolExecutor for concurrent fetching
-    # With 5 API keys at 2 calls/sec each, we can handle 10 concurrent requests
-    # Use a pool size that matches our total capacity
-    max_workers = min(len(accounts), 10)  # Don't exceed 10 workers (our total API capacity)
-    
-    logger.info(f"Fetching reels for {len(accounts)} accounts using {max_workers} workers")
+            logger.error("Error fetching reels for %s: %s", username, e, exc_info=True)
+            return None, str(e)
+    
+    # Group accounts by normalized username so each username costs one set of API calls
+    groups_by_username = {}
+    for account in accounts:
+        username = str(account.username).strip().lstrip('@').lower()
+        groups_by_username.setdefault(username, []).append(account)
+    account_groups = list(groups_by_username.values())
+    
+    # Size the pool so in-flight requests cover the combined API budget for the observed latency
+    # (workers = requests/second * seconds per request), but never below MIN_ACCOUNT_WORKERS or one worker
+    # per key: each account's pages are fetched one after another, so fewer workers leave keys unused.
+    # INSTAGRAM_MAX_INFLIGHT overrides this.
+    api_keys = _API_KEYS
+    group_count = len(account_groups)
+    max_inflight = _MAX_INFLIGHT
+    if not max_inflight:
+        max_inflight = max(MIN_ACCOUNT_WORKERS, len(api_keys))
+        if _avg_request_latency is not None:
+            max_inflight = max(max_inflight, math.ceil(len(api_keys) * CALLS_PER_SECOND_PER_KEY * _avg_request_latency))
+    max_workers = min(group_count, max(1, max_inflight), MAX_ACCOUNT_WORKERS)
+    
+    logger.info("Fetching reels for %s accounts (%s unique usernames) using %s workers", len(results), group_count, max_workers)
+    
+    # Workers hand finished accounts straight to the calling thread, which records and logs them.
+    # Bounded so workers can't run far ahead of the caller: at most 2 results per worker wait here.
+    completed = queue.Queue(maxsize=max_workers * 2)
+    
+    # Deal accounts out in order before any worker starts, so no locking is needed here and
+    # worker i begins with the i-th account (same start order as a single FIFO queue)
+    work_deques = [_AccountDeque() for _ in range(max_workers)]
+    for index, group in enumerate(account_groups):
+        work_deques[index % max_workers].items.append(group)
+    
+    def next_group(worker_index):
+        """Pop from the worker's own deque, falling back to stealing half of another worker's queue."""
+        own_deque = work_deques[worker_index]
+        group = own_deque.pop_head()
+        if group is not None:
+            return group
+        # Start with the neighbouring deque so idle workers spread out over different victims
+        for offset in range(1, max_workers):
+            stolen = work_deques[(worker_index + offset) % max_workers].steal_half()
+            if stolen:
+                # Keep the first stolen group and queue the rest locally (where others can steal them back)
+                own_deque.extend(stolen[1:])
+                return stolen[0]
+        return None
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
-        future_to_account = {
-            executor.submit(fetch_reels_for_account, account): account
-            for account in accounts
-        }
-        
-        # Process completed tasks
-        for future in as_completed(future_to_account):
-            account = future_to_account[future]
+    def run_worker(worker_index):
+        """Fetch reels for account groups until every deque is empty."""
+        while True:
+            group = next_group(worker_index)
+            if group is None:
+                return
+            completed.put((group, *fetch_reels_for_group(group)))
+    
+    executor = _get_shared_executor("accounts", MAX_ACCOUNT_WORKERS)
+    # Worker futures in submission order; only checked if results stop arriving
+    workers = [executor.submit(run_worker, worker_index) for worker_index in range(max_workers)]
+    
+    # All work was dealt out before the workers started, so submission never waits on collection:
+    # the calling thread acts as the collator from here on, overlapping with the workers' fetches.
+    # Every group is taken from exactly one deque, so exactly group_count results arrive
+    for _ in range(group_count):
+        while True:
             try:
-                account_id, reels, error = future.result()
-                results[account_id] = {
-                    'reels': reels,
-                    'error': error,
-                    'account': account
-                }
-                if error:
-                    logger.error(f"Error fetching reels for account {account.username}: {error}")
-                else:
-                    logger.info(f"Successfully fetched {len(reels)} reels for {account.username}")
-            except Exception as e:
-                logger.error(f"Exception fetching reels for account {account.username}: {e}", exc_info=True)
-                results[account.id] = {
-                    'reels': [],
-                    'error': str(e),
-                    'account': account
-                }
+                group, reels, error = completed.get(timeout=1)
+                break
+            except queue.Empty:
+                if not all(worker.done() for worker in workers):
+                    continue
+                # Every worker has exited: take anything put just before the last one finished,
+                # otherwise a worker crashed, so surface its exception
+                if not completed.empty():
+                    continue
+                for worker in workers:
+                    worker.result()
+                raise RuntimeError("Reel fetch workers exited before all accounts were processed")
+        for index, account in enumerate(group):
+            if error:
+                results[account.id] = ReelFetchResult.empty(account, error)
+                logger.error("Error fetching reels for account %s: %s", account.username, error)
+                continue
+            # Later accounts get their own copies so callers can't mutate another account's reels
+            results[account.id] = ReelFetchResult(
+                reels if index == 0 else [dict(reel) for reel in reels],
+                None,
+                account
+            )
+            logger.info("Successfully fetched %s reels for %s", len(reels), account.username)
     
     return results
-
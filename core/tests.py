@@ -0,0 +1,384 @@
+"""
+Tests for the Instagram fetch service.
+The RapidAPI layer (_make_api_request) is mocked, so no network access or API keys are needed.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from core.services import instagram_service
+
+
+def _node(pk, hours_old, reel=False):
+    """Minimal post node as returned inside a page's edges."""
+    node = {
+        "pk": str(pk),
+        "code": f"C{pk}",
+        "taken_at": int(time.time()) - hours_old * 3600,
+        "caption": {"text": f"post {pk}"},
+        "like_count": 1,
+        "comment_count": 1,
+    }
+    if reel:
+        node["product_type"] = "clips"
+        node["play_count"] = 10
+    return node
+
+
+def _page(nodes, next_cursor=None):
+    """Page response in the GraphQL edges format."""
+    return {
+        "result": {
+            "edges": [{"node": node} for node in nodes],
+            "page_info": {"has_next_page": bool(next_cursor), "end_cursor": next_cursor},
+        }
+    }
+
+
+def _response(status_code, body=b'{"ok": true}'):
+    """requests.Response with a fixed status and JSON body."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    return response
+
+
+class ParseInstagramPostTests(SimpleTestCase):
+    """Field resolution in parse_instagram_post."""
+
+    def test_nested_media_fields_take_precedence_over_the_node(self):
+        node = _node(1, 1)
+        node["media"] = {"code": "MEDIA", "like_count": 7, "carousel_media_count": 3}
+        post = instagram_service.parse_instagram_post(node)
+
+        self.assertEqual(post["post_code"], "MEDIA")
+        self.assertEqual(post["like_count"], 7)
+        self.assertTrue(post["is_carousel"])
+        # Fields only present on the node still resolve
+        self.assertEqual(post["comment_count"], 1)
+        self.assertEqual(post["post_id"], "1")
+
+    def test_none_in_nested_media_shadows_the_node_value(self):
+        node = _node(1, 1)
+        node["media"] = {"like_count": None}
+        self.assertEqual(instagram_service.parse_instagram_post(node)["like_count"], 0)
+
+    def test_reel_without_nested_media(self):
+        post = instagram_service.parse_instagram_post(_node(2, 1, reel=True))
+
+        self.assertTrue(post["is_reel"])
+        self.assertEqual(post["play_count"], 10)
+        self.assertEqual(post["caption"], "post 2")
+
+    def test_reel_without_caption_or_video_logs_no_warnings(self):
+        node = _node(4, 1, reel=True)
+        del node["caption"]
+        with self.assertNoLogs(instagram_service.logger, level="WARNING"):
+            post = instagram_service.parse_instagram_post(node)
+        self.assertEqual((post["caption"], post["video_url"]), ("", ""))
+
+    def test_video_url_falls_back_to_media_when_node_versions_have_no_url(self):
+        node = _node(3, 1, reel=True)
+        node["video_versions"] = [{"url": ""}]
+        node["media"] = {"video_versions": [{"url": "https://cdn.example/media.mp4"}]}
+        self.assertEqual(instagram_service.parse_instagram_post(node)["video_url"], "https://cdn.example/media.mp4")
+
+    def test_video_url_prefers_the_node(self):
+        node = _node(3, 1, reel=True)
+        node["video_versions"] = [{"url": "https://cdn.example/node.mp4"}]
+        node["media"] = {"video_versions": [{"url": "https://cdn.example/media.mp4"}]}
+        self.assertEqual(instagram_service.parse_instagram_post(node)["video_url"], "https://cdn.example/node.mp4")
+
+    def test_video_url_skips_empty_version_lists(self):
+        node = _node(3, 1, reel=True)
+        node["video_versions"] = []
+        node["media"] = {"video_versions": [{"url": "https://cdn.example/media.mp4"}]}
+        self.assertEqual(instagram_service.parse_instagram_post(node)["video_url"], "https://cdn.example/media.mp4")
+
+
+def _snowflake(dt):
+    """Instagram snowflake ID whose timestamp bits encode dt."""
+    return (int(dt.timestamp() * 1000) - instagram_service.INSTAGRAM_EPOCH_MS) << 22
+
+
+class TimestampFromPostIdTests(SimpleTestCase):
+    """Snowflake fallback used when a post has no usable taken_at."""
+
+    def setUp(self):
+        self.created = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+        self.max_date = self.created + timedelta(days=1)
+
+    def test_int_and_ascii_digit_string_decode_the_same(self):
+        post_id = _snowflake(self.created)
+        self.assertEqual(instagram_service._timestamp_from_post_id(post_id, self.max_date), self.created)
+        self.assertEqual(instagram_service._timestamp_from_post_id(str(post_id), self.max_date), self.created)
+
+    def test_ids_after_max_date_are_rejected(self):
+        post_id = _snowflake(self.created + timedelta(days=2))
+        self.assertIsNone(instagram_service._timestamp_from_post_id(str(post_id), self.max_date))
+
+    def test_non_ascii_digits_take_the_validating_path(self):
+        # int() accepts Arabic-Indic digits; they must still be range-checked like any non-ASCII input
+        arabic_indic = "\u0661\u0662\u0663"
+        with mock.patch.object(instagram_service, "_extract_timestamp_from_post_id", return_value=None) as slow_path:
+            self.assertIsNone(instagram_service._timestamp_from_post_id(arabic_indic, self.max_date))
+        slow_path.assert_called_once_with(arabic_indic)
+
+    def test_parser_falls_back_to_the_post_id(self):
+        node = _node(_snowflake(self.created), 1)
+        del node["taken_at"]
+        post = instagram_service.parse_instagram_post(node, now=self.created + timedelta(hours=1))
+        self.assertEqual(post["taken_at"], self.created)
+
+
+class RateLimiterTests(SimpleTestCase):
+    """Per-key GCRA spacing in _wait_for_rate_limit."""
+
+    def setUp(self):
+        self.clock = SimpleNamespace(monotonic=lambda: 100.0, sleep=mock.Mock())
+        for patcher in (
+            mock.patch.dict(instagram_service._key_tat, clear=True),
+            mock.patch.object(instagram_service, "time", self.clock),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def waits(self):
+        return [call.args[0] for call in self.clock.sleep.call_args_list]
+
+    def test_back_to_back_requests_on_one_key_are_spaced(self):
+        for _ in range(3):
+            instagram_service._wait_for_rate_limit("k1")
+        interval = instagram_service.KEY_REQUEST_INTERVAL
+        self.assertEqual(self.waits(), [interval, 2 * interval])
+
+    def test_keys_are_limited_independently(self):
+        instagram_service._wait_for_rate_limit("k1")
+        instagram_service._wait_for_rate_limit("k2")
+        self.clock.sleep.assert_not_called()
+
+    def test_idle_key_does_not_bank_credit(self):
+        instagram_service._key_tat["k1"] = 50.0
+        instagram_service._wait_for_rate_limit("k1")
+        instagram_service._wait_for_rate_limit("k1")
+        self.assertEqual(self.waits(), [instagram_service.KEY_REQUEST_INTERVAL])
+
+    def test_cool_down_delays_the_next_slot(self):
+        instagram_service._cool_down_api_key("k1", 30)
+        instagram_service._wait_for_rate_limit("k1")
+        self.assertEqual(self.waits(), [30])
+
+
+class ApiKeyRotationTests(SimpleTestCase):
+    """Key selection and 401/403 benching in _make_api_request."""
+
+    def setUp(self):
+        self.statuses = {}
+        self.used_keys = []
+        for patcher in (
+            mock.patch.dict(instagram_service._api_key_disabled_until, clear=True),
+            mock.patch.dict(instagram_service._key_tat, clear=True),
+            mock.patch.dict(instagram_service._key_inflight, clear=True),
+            mock.patch.object(instagram_service, "_wait_for_rate_limit"),
+            mock.patch.object(instagram_service, "_session", SimpleNamespace(post=self.fake_post)),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fake_post(self, url, json, headers, timeout):
+        api_key = headers["x-rapidapi-key"]
+        self.used_keys.append(api_key)
+        return _response(self.statuses[api_key].pop(0))
+
+    def request(self, *api_keys):
+        with mock.patch.object(instagram_service, "_API_KEYS", api_keys):
+            return instagram_service._make_api_request(instagram_service._URL_POSTS, {"username": "user"})
+
+    def test_last_usable_key_is_not_benched_on_403(self):
+        self.statuses = {"k1": [403, 200]}
+        self.assertIsNone(self.request("k1"))
+        self.assertEqual(instagram_service._last_request_failure_status(), 403)
+        self.assertEqual(instagram_service._api_key_disabled_until, {})
+        # The next request still goes out on the same key
+        self.assertEqual(self.request("k1"), {"ok": True})
+        self.assertEqual(self.used_keys, ["k1", "k1"])
+
+    def test_last_usable_key_is_not_benched_on_401(self):
+        self.statuses = {"k1": [401]}
+        self.assertIsNone(self.request("k1"))
+        self.assertEqual(instagram_service._last_request_failure_status(), 401)
+        self.assertEqual(instagram_service._api_key_disabled_until, {})
+
+    def test_403_from_two_keys_benches_neither(self):
+        self.statuses = {"k1": [403], "k2": [403]}
+        self.assertIsNone(self.request("k1", "k2"))
+        self.assertEqual(instagram_service._last_request_failure_status(), 403)
+        self.assertEqual(self.used_keys, ["k1", "k2"])
+        self.assertEqual(instagram_service._api_key_disabled_until, {})
+
+    def test_403_key_is_benched_once_another_key_succeeds(self):
+        self.statuses = {"k1": [403], "k2": [200]}
+        self.assertEqual(self.request("k1", "k2"), {"ok": True})
+        self.assertEqual(set(instagram_service._api_key_disabled_until), {"k1"})
+
+    def test_401_key_is_benched_while_another_key_is_usable(self):
+        self.statuses = {"k1": [401], "k2": [200, 200]}
+        self.assertEqual(self.request("k1", "k2"), {"ok": True})
+        self.assertEqual(set(instagram_service._api_key_disabled_until), {"k1"})
+        # The benched key is skipped on later requests
+        self.request("k1", "k2")
+        self.assertEqual(self.used_keys, ["k1", "k2", "k2"])
+
+    def test_all_keys_disabled_reports_a_status(self):
+        until = time.monotonic() + 60
+        instagram_service._api_key_disabled_until.update({"k1": until, "k2": until})
+        self.assertIsNone(self.request("k1", "k2"))
+        self.assertEqual(instagram_service._last_request_failure_status(), 401)
+        self.assertEqual(self.used_keys, [])
+
+    def test_pick_prefers_the_key_whose_slot_opens_soonest(self):
+        instagram_service._key_tat.update({"k1": time.monotonic() + 3, "k2": time.monotonic() + 1})
+        api_key = instagram_service._pick_api_key(["k1", "k2"])
+        self.addCleanup(instagram_service._release_api_key, api_key)
+        self.assertEqual(api_key, "k2")
+
+    def test_pick_breaks_ties_by_fewest_inflight_requests(self):
+        first = instagram_service._pick_api_key(["k1", "k2"])
+        second = instagram_service._pick_api_key(["k1", "k2"])
+        self.assertEqual({first, second}, {"k1", "k2"})
+
+
+class FetchPageResponseTests(SimpleTestCase):
+    """Coalescing of identical in-flight page requests."""
+
+    def test_concurrent_identical_requests_share_one_api_call(self):
+        owner_entered = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def fake_request(url, payload, method="POST"):
+            calls.append(payload)
+            owner_entered.set()
+            release.wait(5)
+            return _page([_node(1, 1)])
+
+        results = []
+
+        def fetch():
+            results.append(instagram_service._fetch_page_response(instagram_service._URL_POSTS, "user", None))
+
+        with mock.patch.object(instagram_service, "_make_api_request", side_effect=fake_request):
+            owner = threading.Thread(target=fetch)
+            owner.start()
+            self.assertTrue(owner_entered.wait(5))
+            # The owner is blocked inside the API call, so these join its in-flight request
+            joiners = [threading.Thread(target=fetch) for _ in range(3)]
+            for thread in joiners:
+                thread.start()
+            time.sleep(0.2)
+            release.set()
+            for thread in [owner] + joiners:
+                thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(instagram_service._inflight_pages, {})
+
+    def test_exception_reaches_every_waiter_and_clears_the_entry(self):
+        with mock.patch.object(instagram_service, "_make_api_request", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                instagram_service._fetch_page_response(instagram_service._URL_POSTS, "user", "cursor")
+        self.assertEqual(instagram_service._inflight_pages, {})
+
+
+@override_settings(TEST_MODE_POSTS_LIMIT=0, TEST_MODE_PAGES_LIMIT=0)
+class IterAllPostsCutoffTests(SimpleTestCase):
+    """Age cutoff handling in iter_all_posts_for_username."""
+
+    def setUp(self):
+        self.pages = {
+            "": _page([_node(1, 1), _node(2, 2)], next_cursor="c2"),
+            "c2": _page([_node(3, 3), _node(4, 100), _node(5, 101)], next_cursor="c3"),
+            "c3": _page([_node(6, 200)]),
+        }
+        self.requested = []
+
+    def fake_request(self, url, payload, method="POST"):
+        self.requested.append(payload["maxId"])
+        return self.pages[payload["maxId"]]
+
+    def test_stops_paginating_at_the_page_with_the_first_old_post(self):
+        saved = []
+        with mock.patch.object(instagram_service, "_make_api_request", side_effect=self.fake_request):
+            posts = list(instagram_service.iter_all_posts_for_username("user", max_age_hours=48, save_callback=saved.extend))
+
+        self.assertEqual([post["post_id"] for post in posts], ["1", "2", "3"])
+        self.assertEqual(saved, posts)
+        self.assertEqual(self.requested, ["", "c2"])
+
+    def test_without_cutoff_fetches_every_page(self):
+        with mock.patch.object(instagram_service, "_make_api_request", side_effect=self.fake_request):
+            posts = list(instagram_service.iter_all_posts_for_username("user"))
+
+        self.assertEqual(len(posts), 6)
+        self.assertEqual(self.requested, ["", "c2", "c3"])
+
+
+@override_settings(TEST_MODE_REELS_LIMIT=None)
+class FetchReelsForAccountsTests(SimpleTestCase):
+    """fetch_reels_for_accounts returns one result per account, including failed ones."""
+
+    def setUp(self):
+        instagram_service.clear_fetch_cache()
+
+    def tearDown(self):
+        instagram_service.clear_fetch_cache()
+
+    def test_failed_username_still_gets_a_result_per_account(self):
+        def fake_request(url, payload, method="POST"):
+            if payload["username"] == "broken":
+                raise RuntimeError("worker blew up")
+            return _page([_node(10, 1, reel=True), _node(11, 2, reel=True)])
+
+        accounts = [
+            SimpleNamespace(id=1, username="good"),
+            SimpleNamespace(id=2, username="@Good"),
+            SimpleNamespace(id=3, username="broken"),
+            SimpleNamespace(id=4, username="other"),
+        ]
+        with mock.patch.object(instagram_service, "_make_api_request", side_effect=fake_request):
+            results = instagram_service.fetch_reels_for_accounts(accounts)
+
+        self.assertEqual(set(results), {1, 2, 3, 4})
+        for account in accounts:
+            self.assertIsInstance(results[account.id], instagram_service.ReelFetchResult)
+            self.assertIs(results[account.id].account, account)
+
+        self.assertEqual(results[3].reels, [])
+        self.assertIn("worker blew up", results[3].error)
+        for account_id in (1, 2, 4):
+            self.assertIsNone(results[account_id].error)
+            self.assertEqual([reel["post_id"] for reel in results[account_id].reels], ["10", "11"])
+        # Accounts sharing a username share one fetch but not the same reel dicts
+        self.assertIsNot(results[1].reels[0], results[2].reels[0])
+
+    def test_empty_account_list(self):
+        self.assertEqual(instagram_service.fetch_reels_for_accounts([]), {})
+
+    def test_worker_count_never_drops_below_one_per_key(self):
+        accounts = [SimpleNamespace(id=i, username=f"user{i}") for i in range(20)]
+        keys = tuple(f"k{i}" for i in range(13))
+        # 13 keys * 0.25 calls/second * 1s latency would size the pool at 4 workers
+        with mock.patch.object(instagram_service, "_API_KEYS", keys), \
+                mock.patch.object(instagram_service, "_avg_request_latency", 1.0), \
+                mock.patch.object(instagram_service, "get_all_reels_for_username", return_value=[]), \
+                self.assertLogs(instagram_service.logger, level="INFO") as logs:
+            instagram_service.fetch_reels_for_accounts(accounts)
+
+        self.assertIn("using 13 workers", logs.output[0])
@@ -163,6 +163,8 @@ RAPIDAPI_HOST = 'instagram120.p.rapidapi.com'
 DEBUG_SAVE_RESPONSES = os.environ.get('DEBUG_SAVE_RESPONSES', 'False').lower() == 'true'
 # Maximum number of response files to keep per endpoint type (prevents disk space issues)
 DEBUG_MAX_RESPONSE_FILES = int(os.environ.get('DEBUG_MAX_RESPONSE_FILES', '50'))
+# Debug: Print/log the raw and converted timestamps of every parsed reel (very verbose)
+DEBUG_REEL_TIMESTAMPS = os.environ.get('DEBUG_REEL_TIMESTAMPS', 'False').lower() == 'true'
 
 # Skip reels endpoint for play_count fetching (if rate limits are an issue)
 # When True, only uses posts endpoint and fallback extraction for play_count
@@ -181,6 +183,15 @@ TEST_MODE_POSTS_LIMIT = int(os.environ.get('TEST_MODE_POSTS_LIMIT', '600'))
 # Set to None or 0 to disable page limit and fetch all pages
 TEST_MODE_PAGES_LIMIT = int(os.environ.get('TEST_MODE_PAGES_LIMIT', '50'))
 
+# Cache fetched reels (fetch_instagram_reels) per username for this many seconds
+# Accounts re-polled within the window are served from memory without hitting the API
+# Set to 0 to disable caching
+INSTAGRAM_FETCH_CACHE_TTL = int(os.environ.get('INSTAGRAM_FETCH_CACHE_TTL', '60'))
+
+# Maximum number of accounts fetched concurrently by fetch_reels_for_accounts
+# Set to 0 to size automatically from the API key budget and measured request latency
+INSTAGRAM_MAX_INFLIGHT = int(os.environ.get('INSTAGRAM_MAX_INFLIGHT', '0'))
+
 # Discord Webhook Configuration
 # Discord webhook URL for sending notifications about new Instagram posts
 # Set in environment variable DISCORD_WEBHOOK_URL
@@ -202,7 +213,8 @@ LOGGING = {
     'disable_existing_loggers': False,
     'handlers': {
         'console': {
-            'class': 'logging.StreamHandler',
+            # StreamHandler that writes from a background QueueListener thread
+            'class': 'core.logging_handlers.BackgroundStreamHandler',
         },
     },
     'root': {
@@ -217,7 +229,9 @@ LOGGING = {
         },
         'core.services': {
             'handlers': ['console'],
-            'level': 'DEBUG',
+            # INFO by default: the parsers log per-post detail at DEBUG, which is then dropped before
+            # its arguments are formatted. Set INSTAGRAM_SERVICE_LOG_LEVEL=DEBUG to see it.
+            'level': os.environ.get('INSTAGRAM_SERVICE_LOG_LEVEL', 'INFO'),
             'propagate': False,
         },
     },